@@ -8,6 +8,7 @@ import sys
 from dotenv import load_dotenv
 
 from jaclang.cli.cmdreg import CommandPriority, cmd_registry
+from jaclang.runtimelib.memory import StoragePool
 from jaclang.runtimelib.runtime import ExecutionContext, hookimpl, plugin_manager
 from jaclang.runtimelib.runtime import JacRuntime as Jac
 
@@ -60,6 +61,8 @@ class JacCmd:
             port: int = 8000,
             main: bool = True,
             faux: bool = False,
+            threaded: bool = True,
+            workers: int = 1,
         ) -> None:
             """Start a REST API server for the specified .jac file.
 
@@ -77,12 +80,15 @@ class JacCmd:
                 port: Port to run the server on (default: 8000)
                 main: Treat the module as __main__ (default: True)
                 faux: Perform introspection and print endpoint docs without starting server (default: False)
+                threaded: Run sync endpoints concurrently (default: True)
+                workers: Number of pre-forked worker processes, needs Redis (default: 1)
 
             Examples:
                 jac serve myprogram.jac
                 jac serve myprogram.jac --port 8080
                 jac serve myprogram.jac --session myapp.session
                 jac serve myprogram.jac --faux
+                jac serve myprogram.jac --workers 4
             """
 
             # Process file and session
@@ -146,7 +152,7 @@ class JacCmd:
             # mach.close()
 
             try:
-                server.start()
+                server.start(threaded=threaded, workers=workers)
             except KeyboardInterrupt:
                 print("\nServer stopped.")
                 mach.close()  # Close on shutdown
@@ -163,9 +169,11 @@ class JacScalePlugin:
     @staticmethod
     @hookimpl
     def create_j_context(
-        session: str | None = None, root: str | None = None
+        session: str | None = None,
+        root: str | None = None,
+        pool: StoragePool | None = None,
     ) -> ExecutionContext:
-        return JScaleExecutionContext(session=session, root=root)
+        return JScaleExecutionContext(session=session, root=root, pool=pool)
 
 
 # Register the plugin
@@ -0,0 +1,372 @@
+"""Tests for the jac-scale memory hierarchy."""
+
+import gc
+from typing import Any
+from uuid import UUID, uuid4
+
+import redis
+
+from jaclang.runtimelib.archetype import AccessLevel, NodeAnchor, NodeArchetype, Root
+from jaclang.runtimelib.codec import dumps
+from jaclang.runtimelib.memory import StoragePool
+from jaclang.runtimelib.runtime import JacRuntime as Jac
+
+from ..context import JScaleExecutionContext
+
+from ..memory_hierarchy import LRUMemory, MongoDB, MultiHierarchyMemory, RedisDB
+
+
+class Item(NodeArchetype):
+    """Node stored through the memory hierarchy."""
+
+    value: int = 0
+
+
+class FakeRedis:
+    """In-memory Redis client recording the commands it receives."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, bytes] = {}
+        self.calls: list[str] = []
+        self.down = False
+
+    def _call(self, name: str) -> None:
+        self.calls.append(name)
+        if self.down:
+            raise redis.ConnectionError("redis is down")
+
+    def ping(self) -> bool:
+        self._call("ping")
+        return True
+
+    def get(self, key: str) -> bytes | None:
+        self._call("get")
+        return self.data.get(key)
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        self._call("mget")
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key: str, value: bytes) -> None:
+        self._call("set")
+        self.data[key] = value
+
+    def mset(self, mapping: dict[str, bytes]) -> None:
+        self._call("mset")
+        self.data.update(mapping)
+
+    def delete(self, key: str) -> None:
+        self._call("delete")
+        self.data.pop(key, None)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeCollection:
+    """In-memory MongoDB collection recording queries and bulk writes."""
+
+    def __init__(self) -> None:
+        self.docs: dict[str, dict[str, Any]] = {}
+        self.queries: list[dict[str, Any]] = []
+        self.bulk_writes: list[int] = []
+
+    def find(
+        self, query: dict[str, Any], projection: dict[str, int] | None = None
+    ) -> list[dict[str, Any]]:
+        self.queries.append(query)
+        return [
+            {"_id": key, **self.docs[key]}
+            for key in query["_id"]["$in"]
+            if key in self.docs
+        ]
+
+    def find_one(self, query: dict[str, Any]) -> dict[str, Any] | None:
+        self.queries.append(query)
+        doc = self.docs.get(query["_id"])
+        return {"_id": query["_id"], **doc} if doc else None
+
+    def bulk_write(self, ops: list[Any]) -> None:
+        self.bulk_writes.append(len(ops))
+        for op in ops:
+            self.docs[op._filter["_id"]] = op._doc["$set"]
+
+
+class FakeMongoClient:
+    """MongoDB client serving a single fake collection."""
+
+    def __init__(self) -> None:
+        self.collection = FakeCollection()
+
+    def __getitem__(self, name: str) -> dict[str, FakeCollection]:
+        return {"anchors": self.collection} if name == "jac_db" else {}
+
+    def close(self) -> None:
+        pass
+
+
+def make_anchors(count: int) -> list[NodeAnchor]:
+    """Create persistent anchors that have not been saved yet."""
+    anchors = [Item(value=i).__jac__ for i in range(count)]
+    for anchor in anchors:
+        anchor.persistent = True
+    return anchors
+
+
+def make_pool(fake_redis: FakeRedis, client: FakeMongoClient) -> StoragePool:
+    """Create a storage pool whose Redis and MongoDB handlers are fakes."""
+    pool = StoragePool()
+    pool.shared("jac_scale:redis", lambda: RedisDB(redis_client=fake_redis))
+    pool.shared("jac_scale:mongo", lambda: MongoDB(client=client))
+    return pool
+
+
+def make_memory(fake_redis: FakeRedis, client: FakeMongoClient) -> MultiHierarchyMemory:
+    """Create a memory hierarchy whose Redis and MongoDB handlers are fakes."""
+    return MultiHierarchyMemory(pool=make_pool(fake_redis, client))
+
+
+def test_redis_circuit_breaker() -> None:
+    """Test that Redis health is cached and rechecked after retry_interval."""
+    fake = FakeRedis()
+    fake.down = True
+    db = RedisDB(redis_client=fake, retry_interval=60)
+    assert not db.redis_is_available()
+    assert not db.redis_is_available()
+    assert fake.calls == ["ping"]
+
+    fake.down = False
+    db._retry_at = 0.0
+    assert db.redis_is_available()
+    assert db.redis_is_available()
+    assert fake.calls == ["ping", "ping"]
+
+    fake.down = True
+    assert db.find_by_id(uuid4()) is None
+    assert not db.redis_is_available()
+    assert fake.calls == ["ping", "ping", "get"]
+
+
+def test_redis_failed_writes_trip_the_breaker() -> None:
+    """Test that failing Redis writes mark Redis unavailable."""
+    fake = FakeRedis()
+    db = RedisDB(redis_client=fake, retry_interval=60)
+    anchors = make_anchors(2)
+    assert db.redis_is_available()
+    fake.down = True
+    db.commit(keys=anchors)
+    assert not db.redis_is_available()
+    assert fake.calls == ["ping", "mset"]
+
+
+def test_redis_batches_reads_and_writes() -> None:
+    """Test that Redis loads with one MGET and saves with one MSET."""
+    fake = FakeRedis()
+    db = RedisDB(redis_client=fake)
+    anchors = make_anchors(3)
+    db.commit(keys=anchors)
+    found = db.find_many([anchor.id for anchor in anchors] + [uuid4()])
+    assert fake.calls == ["mset", "mget"]
+    assert sorted(found) == sorted(anchor.id for anchor in anchors)
+    assert [found[a.id].archetype.value for a in anchors] == [0, 1, 2]
+
+
+def test_mongo_batches_reads_and_writes() -> None:
+    """Test that MongoDB saves changed anchors in one bulk write."""
+    client = FakeMongoClient()
+    db = MongoDB(client=client)
+    anchors = make_anchors(3)
+    db.commit(keys=anchors)
+    assert client.collection.bulk_writes == [3]
+    assert not any(anchor.has_changed() for anchor in anchors)
+
+    db.commit(keys=anchors)
+    assert client.collection.bulk_writes == [3]
+    anchors[1].archetype.value = 10
+    db.commit(keys=anchors)
+    assert client.collection.bulk_writes == [3, 1]
+
+    client.collection.queries.clear()
+    found = db.find_many([anchor.id for anchor in anchors])
+    assert len(client.collection.queries) == 1
+    assert [found[a.id].archetype.value for a in anchors] == [0, 10, 2]
+
+
+def test_hierarchy_find_many_round_trips() -> None:
+    """Test that a batch lookup costs one round trip per tier."""
+    fake_redis = FakeRedis()
+    client = FakeMongoClient()
+    anchors = make_anchors(4)
+    MongoDB(client=client).commit(keys=anchors)
+    fake_redis.data[f"anchor:{anchors[0].id}"] = dumps(anchors[0])
+
+    memory = make_memory(fake_redis, client)
+    client.collection.queries.clear()
+    fake_redis.calls.clear()
+    ids: list[UUID] = [anchor.id for anchor in anchors]
+    found = memory.find_many(ids)
+    assert sorted(found) == sorted(ids)
+    assert fake_redis.calls == ["mget", "mset"]
+    assert len(client.collection.queries) == 1
+    assert len(fake_redis.data) == 4
+
+    assert memory.find_many(ids) == found
+    assert fake_redis.calls == ["mget", "mset"]
+    assert len(client.collection.queries) == 1
+
+
+def test_lru_memory_evicts_only_when_asked() -> None:
+    """Test that LRUMemory evicts the coldest persistent anchors on evict()."""
+    memory = LRUMemory(capacity=2)
+    cold, warm, hot = make_anchors(3)
+    local = Item().__jac__
+    for anchor in (local, cold, warm, hot):
+        memory.set(anchor)
+    assert memory.find_by_id(cold.id) is cold
+    assert len(memory.get_mem()) == 4
+
+    memory.evict()
+    assert list(memory.get_mem()) == [local.id, cold.id]
+    assert memory.stats()["evictions"] == 2
+    assert memory.find_by_id(local.id) is local
+
+
+def test_lru_memory_keeps_referenced_anchors() -> None:
+    """Test that evicted anchors still in use come back as the same object."""
+    memory = LRUMemory(capacity=0)
+    kept, dropped = make_anchors(2)
+    kept.mark_clean()
+    dropped_id = dropped.id
+    memory.set(kept)
+    memory.set(dropped)
+    memory.evict()
+    assert not memory.get_mem()
+
+    del dropped
+    gc.collect()
+    assert memory.find_by_id(dropped_id) is None
+    assert memory.changed_evicted() == []
+    kept.archetype.value = 5
+    assert memory.changed_evicted() == [kept]
+    assert memory.find_by_id(kept.id) is kept
+    assert memory.stats()["hits"] == 1 and memory.stats()["misses"] == 1
+
+    memory.evict()
+    memory.remove(kept.id)
+    assert memory.find_by_id(kept.id) is None
+
+
+def test_hierarchy_commits_evicted_changes() -> None:
+    """Test that changes made after eviction are still committed."""
+    fake_redis = FakeRedis()
+    client = FakeMongoClient()
+    memory = make_memory(fake_redis, client)
+    memory.mem.capacity = 1
+    anchors = make_anchors(3)
+    for anchor in anchors:
+        memory.set(anchor)
+    assert len(memory.mem.get_mem()) == 3
+    assert client.collection.bulk_writes == []
+
+    memory.commit()
+    assert client.collection.bulk_writes == [3]
+    assert list(memory.mem.get_mem()) == [anchors[2].id]
+
+    anchors[0].archetype.value = 7
+    memory.commit()
+    assert client.collection.bulk_writes == [3, 1]
+    assert memory.find_by_id(anchors[0].id) is anchors[0]
+
+
+def test_hierarchy_writes_only_changed_anchors() -> None:
+    """Test that a commit encodes changed anchors once for both tiers."""
+    fake_redis = FakeRedis()
+    client = FakeMongoClient()
+    memory = make_memory(fake_redis, client)
+    anchors = make_anchors(3)
+    for anchor in anchors:
+        memory.set(anchor)
+    memory.commit()
+    fake_redis.calls.clear()
+
+    memory.commit()
+    assert fake_redis.calls == []
+    assert client.collection.bulk_writes == [3]
+
+    anchors[1].archetype.value = 5
+    memory.commit()
+    assert fake_redis.calls == ["mset"]
+    assert client.collection.bulk_writes == [3, 1]
+    key = str(anchors[1].id)
+    assert fake_redis.data[f"anchor:{key}"] == client.collection.docs[key]["data"]
+
+
+def test_hierarchy_find_many_duplicate_ids() -> None:
+    """Test that repeated ids are looked up once."""
+    fake_redis = FakeRedis()
+    client = FakeMongoClient()
+    anchors = make_anchors(2)
+    MongoDB(client=client).commit(keys=anchors)
+
+    memory = make_memory(fake_redis, client)
+    client.collection.queries.clear()
+    ids = [anchors[0].id, anchors[1].id, anchors[0].id]
+    found = memory.find_many(ids)
+    assert sorted(found) == sorted({*ids})
+    assert client.collection.queries[0]["_id"]["$in"] == [
+        str(anchors[0].id),
+        str(anchors[1].id),
+    ]
+
+
+def test_context_checks_access_across_roots() -> None:
+    """Test that a jac-scale context checks access to another root's nodes."""
+    fake_redis, client = FakeRedis(), FakeMongoClient()
+    owner, other = Root().__jac__, Root().__jac__
+    node = Item().__jac__
+    node.root = owner.id
+    memory = make_memory(fake_redis, client)
+    for anchor in (owner, other, node):
+        anchor.persistent = True
+        memory.set(anchor)
+    memory.commit()
+
+    ctx = JScaleExecutionContext(pool=make_pool(fake_redis, client))
+    Jac.set_context(ctx)
+    ctx.root_state = ctx.mem.find_by_id(other.id)
+    anchor = ctx.mem.find_by_id(node.id)
+    assert isinstance(anchor, NodeAnchor) and anchor.loaded
+
+    assert not Jac.check_read_access(anchor)
+    Jac.allow_root(anchor.archetype, other.id, AccessLevel.WRITE)
+    assert Jac.check_write_access(anchor)
+    Jac.disallow_root(anchor.archetype, other.id)
+    assert not Jac.check_read_access(anchor)
+    ctx.close()
+    Jac.set_context(Jac.create_j_context())
+
+
+def test_lru_eviction_frees_connected_graph() -> None:
+    """Test that evicting part of a connected graph lets it be freed."""
+    fake_redis, client = FakeRedis(), FakeMongoClient()
+    ctx = JScaleExecutionContext(pool=make_pool(fake_redis, client))
+    Jac.set_context(ctx)
+    memory = ctx.mem.mem
+    memory.capacity = 10
+    node: NodeArchetype = Jac.root()
+    for i in range(200):
+        node = Jac.connect(node, Item(value=i))[0]
+    del node
+    ctx.mem.commit()
+    gc.collect()
+    assert len(memory.get_mem()) == 10
+    assert len(memory.evicted) <= 1
+
+    values = []
+    anchor = ctx.root_state
+    while edges := [e for e in anchor.edges if e.source == anchor]:
+        anchor = edges[0].target
+        values.append(anchor.archetype.value)
+    assert values == list(range(200))
+    ctx.close()
+    Jac.set_context(Jac.create_j_context())
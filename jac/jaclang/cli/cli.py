@@ -1,17 +1,28 @@
 """Command line interface tool for the Jac language."""
 
 import ast as ast3
+import contextlib
 import marshal
 import os
 import pickle
+import re
 import sys
 import types
+from collections.abc import Callable, Iterable, Iterator
 from importlib.metadata import version as pkg_version
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from jaclang.cli.cmdreg import cmd_registry
 
+if TYPE_CHECKING:
+    from jaclang.compiler.program import JacProgram
+
+T = TypeVar("T")
+
 _runtime_initialized = False
+# Warm program of a `jac check --jobs` worker process.
+_worker_prog: "JacProgram | None" = None
 
 
 def _ensure_jac_runtime() -> None:
@@ -24,6 +35,118 @@ def _ensure_jac_runtime() -> None:
         _runtime_initialized = True
 
 
+def _expand_jac_paths(paths: list) -> tuple[list[str], list[str]]:
+    """Split paths into the .jac files they name and the invalid ones."""
+    files: list[str] = []
+    invalid: list[str] = []
+    for path in paths:
+        if path.endswith(".jac"):
+            files.append(path)
+        elif Path(path).is_dir():
+            files.extend(str(jac_file) for jac_file in Path(path).glob("**/*.jac"))
+        else:
+            invalid.append(path)
+    return files, invalid
+
+
+def _init_worker(overrides: dict[str, Any], warm: bool) -> None:
+    """Apply the parent's settings to a worker and optionally warm it up.
+
+    A warm worker keeps one JacProgram with the typeshed builtins loaded.
+    """
+    global _worker_prog
+    from jaclang.settings import settings
+
+    for key, val in overrides.items():
+        setattr(settings, key, val)
+    if warm:
+        from jaclang.compiler.program import JacProgram
+
+        _worker_prog = JacProgram()
+        _worker_prog.get_type_evaluator()
+
+
+def _map_files(
+    func: Callable[[str], T], files: list[str], jobs: int, warm: bool = False
+) -> Iterator[T]:
+    """Map `func` over files in order, across `jobs` processes if above one.
+
+    Files are handed out one at a time in order, so every worker sees its
+    files in the same relative order as a sequential run would.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(files) <= 1:
+        if warm:
+            _init_worker({}, warm)
+        yield from map(func, files)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    from dataclasses import fields
+
+    from jaclang.settings import settings
+
+    overrides = {f.name: getattr(settings, f.name) for f in fields(settings)}
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(files)),
+        initializer=_init_worker,
+        initargs=(overrides, warm),
+    ) as pool:
+        yield from pool.map(func, files)
+
+
+def _check_file(file_path: str) -> tuple[list[str], list[str], str | None]:
+    """Type check a file with the warm program.
+
+    Returns the new errors and warnings as text, or a failure message.
+    """
+    assert _worker_prog is not None
+    prog = _worker_prog
+    if not Path(file_path).exists():
+        return [], [], f"Error: File '{file_path}' does not exist."
+    try:
+        err_start, warn_start = len(prog.errors_had), len(prog.warnings_had)
+        prog.compile(file_path=file_path, type_check=True, no_cgen=True)
+    except Exception as e:
+        return [], [], f"Error checking '{file_path}': {e}"
+    return (
+        [str(e) for e in prog.errors_had[err_start:]],
+        [str(w) for w in prog.warnings_had[warn_start:]],
+        None,
+    )
+
+
+def _format_file(file_path: str) -> tuple[str | None, str, list[str]]:
+    """Format a file, returning the formatted code and the original code.
+
+    On failure the formatted code is None and the error messages are returned.
+    """
+    from jaclang.compiler.program import JacProgram
+
+    if not Path(file_path).exists():
+        return None, "", [f"Error: File '{file_path}' does not exist."]
+    try:
+        prog = JacProgram.jac_file_formatter(file_path)
+        if prog.errors_had:
+            return None, "", [f"{error}" for error in prog.errors_had]
+        return prog.mod.main.gen.jac, prog.mod.main.source.code, []
+    except Exception as e:
+        return None, "", [f"Error formatting '{file_path}': {e}"]
+
+
+def _unseen(alerts: Iterable[str], seen: set[str]) -> list[str]:
+    """Drop alerts already in `seen` and add the rest to it.
+
+    Object addresses in alert text differ between processes and are ignored.
+    """
+    fresh = []
+    for alert in alerts:
+        if (key := re.sub(r" at 0x[0-9a-f]+", "", alert)) not in seen:
+            seen.add(key)
+            fresh.append(alert)
+    return fresh
+
+
 @cmd_registry.register
 def gen_parser() -> str:
     """Generate static parser."""
@@ -34,7 +157,9 @@ def gen_parser() -> str:
 
 
 @cmd_registry.register
-def format(paths: list, outfile: str = "", to_screen: bool = False) -> None:
+def format(
+    paths: list, outfile: str = "", to_screen: bool = False, jobs: int = 1
+) -> None:
     """Format .jac files with improved code style.
 
     Applies consistent formatting to Jac code files to improve readability and
@@ -44,16 +169,16 @@ def format(paths: list, outfile: str = "", to_screen: bool = False) -> None:
         paths: One or more paths to .jac files or directories containing .jac files
         outfile: Optional output file path (only valid when formatting a single file)
         to_screen: Print formatted code to stdout instead of writing to file
+        jobs: Number of worker processes to format with (0 uses every core)
 
     Examples:
         jac format myfile.jac
         jac format file1.jac file2.jac file3.jac
         jac format myproject/
+        jac format myproject/ --jobs 8
         jac format myfile.jac --outfile formatted.jac
         jac format myfile.jac --to_screen
     """
-    from jaclang.compiler.program import JacProgram
-
     if isinstance(paths, str):
         paths = [paths]
 
@@ -71,50 +196,27 @@ def format(paths: list, outfile: str = "", to_screen: bool = False) -> None:
             with open(target_path, "w") as f:
                 f.write(code)
 
-    def format_single_file(file_path: str) -> tuple[bool, bool]:
-        path_obj = Path(file_path)
-        if not path_obj.exists():
-            print(f"Error: File '{file_path}' does not exist.", file=sys.stderr)
-            return False, False
-        try:
-            prog = JacProgram.jac_file_formatter(str(path_obj))
-            if prog.errors_had:
-                for error in prog.errors_had:
-                    print(f"{error}", file=sys.stderr)
-                return False, False
-            formatted_code = prog.mod.main.gen.jac
-            original_code = prog.mod.main.source.code
-            changed = formatted_code != original_code
-            write_formatted_code(formatted_code, str(path_obj))
-            return True, changed
-        except Exception as e:
-            print(f"Error formatting '{file_path}': {e}", file=sys.stderr)
-            return False, False
-
-    total_files = 0
+    files, invalid = _expand_jac_paths(paths)
+    total_files = len(files)
     failed_files = 0
     changed_files = 0
 
-    for path in paths:
-        path_obj = Path(path)
-        if path.endswith(".jac"):
-            total_files += 1
-            success, changed = format_single_file(path)
-            if not success:
-                failed_files += 1
-            elif changed:
-                changed_files += 1
-        elif path_obj.is_dir():
-            for jac_file in path_obj.glob("**/*.jac"):
-                total_files += 1
-                success, changed = format_single_file(str(jac_file))
-                if not success:
-                    failed_files += 1
-                elif changed:
-                    changed_files += 1
-        else:
-            print(f"Error: '{path}' is not a .jac file or directory.", file=sys.stderr)
+    for path in invalid:
+        print(f"Error: '{path}' is not a .jac file or directory.", file=sys.stderr)
+        failed_files += 1
+
+    results = _map_files(_format_file, files, jobs)
+    for file_path, (formatted_code, original_code, errors) in zip(
+        files, results, strict=True
+    ):
+        for error in errors:
+            print(error, file=sys.stderr)
+        if formatted_code is None:
             failed_files += 1
+            continue
+        write_formatted_code(formatted_code, file_path)
+        if formatted_code != original_code:
+            changed_files += 1
 
     if (len(paths) == 1 and Path(paths[0]).is_dir()) or failed_files > 0:
         print(
@@ -170,16 +272,21 @@ def run(
         filename: Path to the .jac, .jir, or .py file to run
         session: Optional session identifier for persistent state
         main: Treat the module as __main__ (default: True)
-        cache: Use cached compilation if available (default: True)
+        cache: Use the __jac_cache__ bytecode cache if available (default: True)
 
     Examples:
         jac run myprogram.jac
         jac run myscript.py
         jac run myprogram.jac --session mysession
         jac run myprogram.jac --no-main
+        jac run myprogram.jac --no-cache
     """
     _ensure_jac_runtime()
     from jaclang.runtimelib.runtime import JacRuntime as Jac
+    from jaclang.settings import settings
+
+    if not cache:
+        settings.bytecode_cache = False
 
     base, mod, mach = proc_file_sess(filename, session)
     lng = filename.split(".")[-1]
@@ -295,7 +402,7 @@ def build(filename: str, typecheck: bool = False) -> None:
 
 
 @cmd_registry.register
-def check(paths: list, print_errs: bool = True) -> None:
+def check(paths: list, print_errs: bool = True, jobs: int = 1) -> None:
     """Run type checker for specified .jac files.
 
     Performs static type analysis on Jac programs to identify potential type errors
@@ -304,14 +411,15 @@ def check(paths: list, print_errs: bool = True) -> None:
     Args:
         paths: One or more paths to .jac files or directories containing .jac files
         print_errs: Print detailed error messages (default: True)
+        jobs: Number of worker processes to check with (0 uses every core)
 
     Examples:
         jac check myprogram.jac
         jac check file1.jac file2.jac file3.jac
         jac check myproject/
+        jac check myproject/ --jobs 8
         jac check myprogram.jac --no-print_errs
     """
-    from jaclang.compiler.program import JacProgram
     from jaclang.settings import settings
 
     allwarn = settings.all_warnings
@@ -319,50 +427,36 @@ def check(paths: list, print_errs: bool = True) -> None:
     if isinstance(paths, str):
         paths = [paths]
 
-    def check_single_file(prog: JacProgram, file_path: str) -> tuple[bool, int, int]:
-        path_obj = Path(file_path)
-        if not path_obj.exists():
-            print(f"Error: File '{file_path}' does not exist.", file=sys.stderr)
-            return False, 0 if allwarn else 1, 0
-        try:
-            err_start, warn_start = len(prog.errors_had), len(prog.warnings_had)
-            prog.compile(file_path=file_path, type_check=True, no_cgen=True)
-            new_errors = prog.errors_had[err_start:]
-            new_warnings = prog.warnings_had[warn_start:]
-            if print_errs:
-                for e in new_errors:
-                    print(f"Error: {e}", file=sys.stderr)
-                for w in new_warnings:
-                    print(f"Warning: {w}", file=sys.stderr)
-            return len(new_errors) == 0, len(new_errors), len(new_warnings)
-        except Exception as e:
-            print(f"Error checking '{file_path}': {e}", file=sys.stderr)
-            return False, 0 if allwarn else 1, 0
-
-    total_files = failed_files = total_errors = total_warnings = 0
-    prog = JacProgram()
-
-    for path in paths:
-        path_obj = Path(path)
-        if path.endswith(".jac"):
-            total_files += 1
-            success, errs, warns = check_single_file(prog, path)
-            total_errors += errs
-            total_warnings += warns
-            if not success:
-                failed_files += 1
-        elif path_obj.is_dir():
-            for jac_file in path_obj.glob("**/*.jac"):
-                total_files += 1
-                success, errs, warns = check_single_file(prog, str(jac_file))
-                total_errors += errs
-                total_warnings += warns
-                if not success:
-                    failed_files += 1
-        else:
-            print(f"Error: '{path}' is not a .jac file or directory.", file=sys.stderr)
+    files, invalid = _expand_jac_paths(paths)
+    total_files = len(files)
+    failed_files = total_errors = total_warnings = 0
+
+    for path in invalid:
+        print(f"Error: '{path}' is not a .jac file or directory.", file=sys.stderr)
+        failed_files += 1
+        total_errors += 0 if allwarn else 1
+
+    # Workers each compile imported modules on their own, so alerts a
+    # sequential run reports once may come back from several files.
+    seen_errors: set[str] = set()
+    seen_warnings: set[str] = set()
+    for errors, warnings, failure in _map_files(_check_file, files, jobs, warm=True):
+        if failure:
+            print(failure, file=sys.stderr)
             failed_files += 1
             total_errors += 0 if allwarn else 1
+            continue
+        errors = _unseen(errors, seen_errors)
+        warnings = _unseen(warnings, seen_warnings)
+        if print_errs:
+            for e in errors:
+                print(f"Error: {e}", file=sys.stderr)
+            for w in warnings:
+                print(f"Warning: {w}", file=sys.stderr)
+        total_errors += len(errors)
+        total_warnings += len(warnings)
+        if errors:
+            failed_files += 1
 
     print(
         f"Checked {total_files} '.jac' files: {total_files - failed_files} passed, "
@@ -599,6 +693,7 @@ def dot(
     node_limit: int = 512,
     saveto: str = "",
     to_screen: bool = False,
+    sample: float = 1.0,
 ) -> None:
     """Generate a DOT graph visualization from a Jac program.
 
@@ -618,12 +713,14 @@ def dot(
         node_limit: Maximum number of nodes to include (default: 512)
         saveto: Output file path for the DOT file (default: <module_name>.dot)
         to_screen: Print DOT output to stdout instead of saving to file (default: False)
+        sample: Fraction of nodes past the starting node to include (default: 1.0)
 
     Examples:
         jac dot myprogram.jac
         jac dot myprogram.jac --initial root_node --depth 3
         jac dot myprogram.jac --traverse --connection edge_type1 edge_type2
         jac dot myprogram.jac --saveto graph.dot
+        jac dot myprogram.jac --sample 0.1
         jac dot myprogram.jac --to_screen
     """
     _ensure_jac_runtime()
@@ -636,17 +733,25 @@ def dot(
         Jac.jac_import(target=mod, base_path=base, override_name="__main__")
         module = Jac.loaded_modules.get("__main__")
         mod_ns = vars(module) if module else {}
+        file_name = saveto if saveto else f"{mod}.dot"
         try:
             node = mod_ns.get(initial, eval(initial, mod_ns)) if initial else None
-            graph = printgraph(
-                node=node,
-                depth=depth,
-                traverse=traverse,
-                edge_type=connection,
-                bfs=bfs,
-                edge_limit=edge_limit,
-                node_limit=node_limit,
-            )
+            with (
+                contextlib.nullcontext(sys.stdout)
+                if to_screen
+                else open(file_name, "w")
+            ) as sink:
+                printgraph(
+                    node=node,
+                    depth=depth,
+                    traverse=traverse,
+                    edge_type=connection,
+                    bfs=bfs,
+                    edge_limit=edge_limit,
+                    node_limit=node_limit,
+                    sample=sample,
+                    sink=sink,
+                )
         except Exception as e:
             print(f"Error while generating graph: {e}")
             import traceback
@@ -655,11 +760,8 @@ def dot(
             jac_machine.close()
             return
         if to_screen:
-            print(graph)
+            print()
         else:
-            file_name = saveto if saveto else f"{mod}.dot"
-            with open(file_name, "w") as file:
-                file.write(graph)
             print(f">>> Graph content saved to {os.path.join(os.getcwd(), file_name)}")
         jac_machine.close()
     else:
@@ -780,6 +882,8 @@ def serve(
     port: int = 8000,
     main: bool = True,
     faux: bool = False,
+    threaded: bool = True,
+    workers: int = 1,
 ) -> None:
     """Start a REST API server for the specified .jac file.
 
@@ -797,12 +901,15 @@ def serve(
         port: Port to run the server on (default: 8000)
         main: Treat the module as __main__ (default: True)
         faux: Perform introspection and print endpoint docs without starting server (default: False)
+        threaded: Handle each request on its own thread (default: True)
+        workers: Number of pre-forked worker processes, needs a sqlite:// session (default: 1)
 
     Examples:
         jac serve myprogram.jac
         jac serve myprogram.jac --port 8080
         jac serve myprogram.jac --session myapp.session
         jac serve myprogram.jac --faux
+        jac serve myprogram.jac --session sqlite://myapp.db --workers 4
     """
     _ensure_jac_runtime()
     from jaclang.runtimelib.runtime import JacRuntime as Jac
@@ -840,7 +947,7 @@ def serve(
             exit(1)
 
     try:
-        server.start()
+        server.start(threaded=threaded, workers=workers)
     except KeyboardInterrupt:
         print("\nServer stopped.")
         mach.close()
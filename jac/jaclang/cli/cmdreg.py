@@ -261,10 +261,11 @@ class CommandRegistry:
             else:
                 arg_msg = f"{type_name}"
             # shorthand is first character by default,
-            # If already taken, use the first 2 characters
+            # If already taken, use the first 2 characters, then 3, and so on
             shorthand = param_name[:1]
-            if f"-{shorthand}" in cmd_parser._option_string_actions:
-                shorthand = param_name[:2]
+            taken = cmd_parser._option_string_actions
+            while f"-{shorthand}" in taken and shorthand != param_name:
+                shorthand = param_name[: len(shorthand) + 1]
             if param_name == "args":
                 cmd_parser.add_argument("args", nargs=argparse.REMAINDER, help=arg_msg)
             elif param_name == "paths":
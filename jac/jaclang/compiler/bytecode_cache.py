@@ -0,0 +1,122 @@
+"""On-disk cache of compiled Jac module bytecode.
+
+Compiled modules are stored in a ``__jac_cache__`` directory next to their
+source, much like ``__pycache__``. Each entry records a digest of everything
+the bytecode depends on: the module source and path, its annex files
+(.impl.jac, .cl.jac, .test.jac), the compiler and the compilation mode. A
+matching entry lets the importer skip the compiler entirely.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import importlib.util
+import marshal
+import os
+import sys
+import types
+from importlib.metadata import PackageNotFoundError, version
+
+from jaclang.compiler.passes.main.annex_pass import find_annex_paths
+
+CACHE_DIR = "__jac_cache__"
+CACHE_FORMAT = b"JACBC001"
+
+_compiler_fingerprint: bytes | None = None
+
+
+def compiler_fingerprint() -> bytes:
+    """Return a digest identifying the compiler that produces the bytecode.
+
+    Besides the jaclang version and the Python bytecode magic number, the
+    compiler sources are fingerprinted by their stats so that editing the
+    compiler in a development checkout invalidates cached modules.
+    """
+    global _compiler_fingerprint
+    if _compiler_fingerprint is None:
+        try:
+            jac_version = version("jaclang")
+        except PackageNotFoundError:
+            jac_version = "dev"
+        digest = hashlib.sha256(CACHE_FORMAT)
+        digest.update(jac_version.encode())
+        digest.update(importlib.util.MAGIC_NUMBER)
+        jac_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        compiler_files = [os.path.join(jac_root, "runtimelib", "builtin.jac")]
+        for dirpath, dirnames, filenames in os.walk(os.path.join(jac_root, "compiler")):
+            dirnames[:] = sorted(d for d in dirnames if d != "tests")
+            compiler_files.extend(
+                os.path.join(dirpath, f)
+                for f in sorted(filenames)
+                if f.endswith((".py", ".jac", ".lark"))
+            )
+        for path in compiler_files:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            digest.update(f"{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+        _compiler_fingerprint = digest.digest()
+    return _compiler_fingerprint
+
+
+def cache_path(source_path: str, minimal: bool) -> str:
+    """Return the cache file path for a Jac module."""
+    directory, filename = os.path.split(source_path)
+    mode = "minimal" if minimal else "full"
+    name = f"{filename[:-4]}.{sys.implementation.cache_tag}.{mode}.jbc"
+    return os.path.join(directory, CACHE_DIR, name)
+
+
+def source_key(source_path: str, minimal: bool) -> bytes | None:
+    """Return the cache key of a module, or None if its sources can't be read."""
+    digest = hashlib.sha256(compiler_fingerprint())
+    digest.update(b"minimal" if minimal else b"full")
+    try:
+        for path in [source_path, *sorted(find_annex_paths(source_path))]:
+            with open(path, "rb") as f:
+                data = f.read()
+            digest.update(f"{path}:{len(data)}:".encode())
+            digest.update(data)
+    except OSError:
+        return None
+    return digest.digest()
+
+
+def load(source_path: str, minimal: bool, key: bytes) -> types.CodeType | None:
+    """Return the cached code object for a module if it matches the key."""
+    try:
+        with open(cache_path(source_path, minimal), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    header = CACHE_FORMAT + key
+    if not data.startswith(header):
+        return None
+    try:
+        codeobj = marshal.loads(data[len(header) :])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return codeobj if isinstance(codeobj, types.CodeType) else None
+
+
+def store(source_path: str, minimal: bool, key: bytes, bytecode: bytes) -> None:
+    """Write a module's marshalled code object to the cache.
+
+    The file is written to a temporary path and moved into place so concurrent
+    readers never observe a partial entry. Failures (e.g. read-only source
+    directories) are ignored, as with ``__pycache__``.
+    """
+    if sys.dont_write_bytecode:
+        return
+    path = cache_path(source_path, minimal)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(CACHE_FORMAT + key + bytecode)
+        os.replace(tmp_path, path)
+    except OSError:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
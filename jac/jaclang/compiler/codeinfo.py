@@ -67,6 +67,8 @@ class CodeGenTarget:
 class CodeLocInfo:
     """Code location info."""
 
+    __slots__ = ("first_tok", "last_tok")
+
     def __init__(
         self,
         first_tok: Token,
@@ -171,5 +171,9 @@ class DeclImplMatchPass(Transform[uni.Module, uni.Module]):
                     for idx in range(len(params_defn)):
                         if (par := params_decl[idx].parent) is not None:
                             loc_in_kid = par.kid.index(params_decl[idx])
-                            par.kid[loc_in_kid] = params_defn[idx]
+                            par.kid = [
+                                *par.kid[:loc_in_kid],
+                                params_defn[idx],
+                                *par.kid[loc_in_kid + 1 :],
+                            ]
                         params_decl[idx] = params_defn[idx]
@@ -19,6 +19,7 @@ compiled to Python bytecode or serialized to Python source code.
 """
 
 import ast as ast3
+import builtins
 import copy
 import textwrap
 from collections.abc import Sequence
@@ -90,6 +91,74 @@ UNARY_OP_MAP: dict[Tok, type[ast3.unaryop]] = {
     Tok.MINUS: ast3.USub,
 }
 
+# Python nodes that open a new variable scope
+SCOPE_TYPES = (
+    ast3.FunctionDef,
+    ast3.AsyncFunctionDef,
+    ast3.Lambda,
+    ast3.ListComp,
+    ast3.SetComp,
+    ast3.DictComp,
+    ast3.GeneratorExp,
+)
+
+
+def bound_names(scope: ast3.AST) -> set[str]:
+    """Get every name bound anywhere inside a Python scope node.
+
+    Nested scopes are included, so the result may over-approximate the names
+    local to ``scope`` itself.
+    """
+    names: set[str] = set()
+    for node in ast3.walk(scope):
+        if isinstance(node, ast3.Name) and not isinstance(node.ctx, ast3.Load):
+            names.add(node.id)
+        elif isinstance(node, ast3.arg):
+            names.add(node.arg)
+        elif isinstance(node, ast3.alias):
+            names.add(node.asname or node.name.split(".")[0])
+        elif isinstance(
+            node,
+            (
+                ast3.FunctionDef,
+                ast3.AsyncFunctionDef,
+                ast3.ClassDef,
+                ast3.ExceptHandler,
+                ast3.MatchAs,
+                ast3.MatchStar,
+            ),
+        ):
+            if node.name:
+                names.add(node.name)
+        elif isinstance(node, ast3.MatchMapping) and node.rest:
+            names.add(node.rest)
+    return names
+
+
+@dataclass
+class PathPlan:
+    """An edge path hoisted into a module level plan."""
+
+    ref: ast3.Name
+    plan: ast3.Call
+    site: ast3.Call
+    opath: ast3.Call
+
+    @property
+    def reads(self) -> set[str]:
+        """Get the free names the plan's filters read."""
+        body = cast(ast3.Lambda, self.plan.args[0]).body
+        return {
+            node.id
+            for node in ast3.walk(body)
+            if isinstance(node, ast3.Name) and isinstance(node.ctx, ast3.Load)
+        } - bound_names(body)
+
+    def inline(self) -> None:
+        """Build the path at its call site again instead of using the plan."""
+        self.opath.args[0] = self.site.args[1]
+        self.site.args = [cast(ast3.Lambda, self.plan.args[0]).body]
+
 
 class PyastGenPass(BaseAstGenPass[ast3.AST]):
     """Jac blue transpilation to python pass."""
@@ -118,6 +187,8 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
         self.builtin_imports: set[str] = set()  # Track individual builtin imports
         self._temp_name_counter: int = 0
         self._hoisted_funcs: list[ast3.FunctionDef | ast3.AsyncFunctionDef] = []
+        # Compiled edge paths, emitted as module level plans in exit_module
+        self.path_plans: list[PathPlan] = []
         self.preamble: list[ast3.AST] = [
             self.sync(
                 ast3.ImportFrom(
@@ -581,6 +652,29 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
             )
 
         merged_body = self._merge_module_bodies(node)
+
+        # Number the path plans of the module and its impl and test modules
+        plans = [plan for child in self.child_passes for plan in child.path_plans]
+        plans.extend(self.path_plans)
+        plans = self._inline_shadowed_plans(
+            plans, [item.gen.py_ast for item in merged_body]
+        )
+        for idx, path_plan in enumerate(plans):
+            path_plan.ref.id = f"_jac_path_{idx}"
+            self.preamble.append(
+                self.sync(
+                    ast3.Assign(
+                        targets=[
+                            self.sync(
+                                ast3.Name(id=path_plan.ref.id, ctx=ast3.Store()),
+                                jac_node=node,
+                            )
+                        ],
+                        value=path_plan.plan,
+                    ),
+                    jac_node=node,
+                )
+            )
         body_items: list[ast3.AST | list[ast3.AST] | None] = [*self.preamble]
         body_items.extend(item.gen.py_ast for item in merged_body)
 
@@ -2995,6 +3089,13 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
             ]
 
     def exit_edge_ref_trailer(self, node: uni.EdgeRefTrailer) -> None:
+        """Generate an edge path expression.
+
+        When every filter of the path only reads module level and builtin
+        names, the path is compiled once into a module level plan, and each
+        evaluation passes just its origin to ``refs``. Other paths are built
+        on every evaluation.
+        """
         origin = None
         cur = node.chain[0]
         chomp = [*node.chain[1:]]
@@ -3003,31 +3104,27 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
         if not isinstance(cur, uni.EdgeOpRef):
             origin = cur.gen.py_ast[0]
             cur = cast(uni.EdgeOpRef, chomp.pop(0))
+        origin = cast(ast3.expr, origin or cur.gen.py_ast[0])
 
-        pynode = self.sync(
-            ast3.Call(
-                func=self.jaclib_obj("OPath"),
-                args=[cast(ast3.expr, origin or cur.gen.py_ast[0])],
-                keywords=[],
-            )
-        )
-
+        hops: list[tuple[uni.EdgeOpRef, uni.Expr | None]] = []
         while True:
+            filt = None
+            if chomp and not isinstance(chomp[0], uni.EdgeOpRef):
+                filt = cast(uni.Expr, chomp.pop(0))
+            hops.append((cur, filt))
+            if chomp:
+                cur = cast(uni.EdgeOpRef, chomp.pop(0))
+            else:
+                break
+
+        hop_keywords: list[list[ast3.keyword]] = []
+        for cur, filt in hops:
             keywords = []
             if cur.filter_cond:
-                keywords.append(
-                    self.sync(
-                        ast3.keyword(
-                            arg="edge",
-                            value=cast(
-                                ast3.expr, self.sync(cur.filter_cond.gen.py_ast[0])
-                            ),
-                        )
-                    )
-                )
-
-            if chomp and not isinstance(chomp[0], uni.EdgeOpRef):
-                filt = chomp.pop(0)
+                keywords.extend(self._filter_keywords(cur.filter_cond, "edge"))
+            if isinstance(filt, uni.FilterCompr):
+                keywords.extend(self._filter_keywords(filt, "node"))
+            elif filt:
                 keywords.append(
                     self.sync(
                         ast3.keyword(
@@ -3036,7 +3133,27 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
                         )
                     )
                 )
+            hop_keywords.append(keywords)
+
+        planned = all(
+            filt is None or isinstance(filt, uni.FilterCompr) for _, filt in hops
+        ) and self._reads_module_names(
+            [kw.value for keywords in hop_keywords for kw in keywords],
+            node.find_parent_of_type(uni.UniScopeNode),
+        )
 
+        opath = pynode = self.sync(
+            ast3.Call(
+                func=self.jaclib_obj("OPath"),
+                args=[
+                    self.sync(ast3.List(elts=[], ctx=ast3.Load()))
+                    if planned
+                    else origin
+                ],
+                keywords=[],
+            )
+        )
+        for (cur, _), keywords in zip(hops, hop_keywords, strict=True):
             pynode = self.sync(
                 ast3.Call(
                     func=self.sync(
@@ -3051,58 +3168,127 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
                 )
             )
 
-            if chomp:
-                cur = cast(uni.EdgeOpRef, chomp.pop(0))
-            else:
-                break
-
-        if node.edges_only:
-            pynode = self.sync(
-                ast3.Call(
-                    func=self.sync(
-                        ast3.Attribute(
-                            value=pynode,
-                            attr="edge",
-                            ctx=ast3.Load(),
-                        )
-                    ),
-                    args=[],
-                    keywords=[],
+        for flag, attr in ((node.edges_only, "edge"), (from_visit, "visit")):
+            if flag:
+                pynode = self.sync(
+                    ast3.Call(
+                        func=self.sync(
+                            ast3.Attribute(
+                                value=pynode,
+                                attr=attr,
+                                ctx=ast3.Load(),
+                            )
+                        ),
+                        args=[],
+                        keywords=[],
+                    )
                 )
-            )
 
-        if from_visit:
-            pynode = self.sync(
+        args: list[ast3.expr] = [pynode]
+        if planned:
+            ref = self.sync(ast3.Name(id="", ctx=ast3.Load()))
+            plan = self.sync(
                 ast3.Call(
-                    func=self.sync(
-                        ast3.Attribute(
-                            value=pynode,
-                            attr="visit",
-                            ctx=ast3.Load(),
+                    func=self.jaclib_obj("OPlan"),
+                    args=[
+                        self.sync(
+                            ast3.Lambda(
+                                args=self.sync(
+                                    ast3.arguments(
+                                        posonlyargs=[],
+                                        args=[],
+                                        kwonlyargs=[],
+                                        kw_defaults=[],
+                                        defaults=[],
+                                    )
+                                ),
+                                body=pynode,
+                            )
                         )
-                    ),
-                    args=[],
+                    ],
                     keywords=[],
                 )
             )
-        if node.is_async:
-            pynode = self.sync(
-                ast3.Call(
-                    func=self.jaclib_obj("arefs"),
-                    args=[pynode],
-                    keywords=[],
-                )
+            args = [ref, origin]
+
+        site = self.sync(
+            ast3.Call(
+                func=self.jaclib_obj("arefs" if node.is_async else "refs"),
+                args=args,
+                keywords=[],
             )
-        else:
-            pynode = self.sync(
-                ast3.Call(
-                    func=self.jaclib_obj("refs"),
-                    args=[pynode],
-                    keywords=[],
+        )
+        if planned:
+            self.path_plans.append(PathPlan(ref, plan, site, opath))
+        node.gen.py_ast = [site]
+
+    def _filter_keywords(
+        self, node: uni.FilterCompr, target: str
+    ) -> list[ast3.keyword]:
+        """Get the path keywords of an edge or node filter.
+
+        The type of the filter is passed as ``edge_type`` or ``node_type``,
+        which also lets the runtime look up edges of that type in the node's
+        edge index instead of scanning every edge.
+        """
+        keywords = []
+        if body := self._filter_compr_lambda(node, typed=False):
+            keywords.append(self.sync(ast3.keyword(arg=target, value=body)))
+        if node.f_type:
+            keywords.append(
+                self.sync(
+                    ast3.keyword(
+                        arg=f"{target}_type",
+                        value=cast(ast3.expr, node.f_type.gen.py_ast[0]),
+                    )
                 )
             )
+        return keywords
 
-        node.gen.py_ast = [pynode]
+    def _reads_module_names(
+        self, exprs: list[ast3.expr], scope: uni.UniScopeNode | None
+    ) -> bool:
+        """Check if expressions only read module level and builtin names."""
+        for expr in exprs:
+            for name in ast3.walk(expr):
+                if not isinstance(name, ast3.Name) or name.id == "i":
+                    continue
+                owner = scope
+                while owner and name.id not in owner.names_in_scope:
+                    owner = owner.parent_scope
+                if owner is None:
+                    if name.id not in builtins.__dict__:
+                        return False
+                elif not isinstance(owner, uni.Module):
+                    return False
+        return True
+
+    def _inline_shadowed_plans(
+        self, plans: list[PathPlan], body: list[ast3.AST | list[ast3.AST] | None]
+    ) -> list[PathPlan]:
+        """Inline the plans whose filters read a name bound in an enclosing scope.
+
+        A plan runs at module level, so its filters would read the module
+        level name instead of the local one. The symbol table misses some
+        bindings, such as walrus targets, so bound names are taken from the
+        generated Python instead.
+        """
+        if not plans:
+            return plans
+        sites = {id(plan.site): plan for plan in plans}
+        inlined: set[int] = set()
+        stack: list[tuple[ast3.AST, frozenset[str]]] = [
+            (item, frozenset()) for item in self._flatten_ast_list(body)
+        ]
+        while stack:
+            pynode, bound = stack.pop()
+            if isinstance(pynode, SCOPE_TYPES):
+                bound = bound | bound_names(pynode)
+            if (plan := sites.get(id(pynode))) and bound & plan.reads:
+                plan.inline()
+                inlined.add(id(plan.site))
+            stack.extend((child, bound) for child in ast3.iter_child_nodes(pynode))
+        return [plan for plan in plans if id(plan.site) not in inlined]
 
     def exit_edge_op_ref(self, node: uni.EdgeOpRef) -> None:
         loc = self.sync(
@@ -3156,6 +3342,16 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
         ]
 
     def exit_filter_compr(self, node: uni.FilterCompr) -> None:
+        if filter_lambda := self._filter_compr_lambda(node):
+            node.gen.py_ast = [filter_lambda]
+
+    def _filter_compr_lambda(
+        self, node: uni.FilterCompr, typed: bool = True
+    ) -> ast3.Lambda | None:
+        """Get the predicate of a filter, or None if it accepts everything.
+
+        With ``typed`` off, the type check of the filter is left out.
+        """
         iter_name = "i"
 
         comprs: list[ast3.Compare | ast3.Call] = (
@@ -3184,7 +3380,7 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
                     )
                 )
             ]
-            if node.f_type
+            if node.f_type and typed
             else []
         )
         comprs.extend(
@@ -3224,22 +3420,21 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
             if len(comprs) > 1
             else (comprs[0] if comprs else None)
         ):
-            node.gen.py_ast = [
-                self.sync(
-                    ast3.Lambda(
-                        args=self.sync(
-                            ast3.arguments(
-                                posonlyargs=[],
-                                args=[self.sync(ast3.arg(arg=iter_name))],
-                                kwonlyargs=[],
-                                kw_defaults=[],
-                                defaults=[],
-                            )
-                        ),
-                        body=body,
-                    )
+            return self.sync(
+                ast3.Lambda(
+                    args=self.sync(
+                        ast3.arguments(
+                            posonlyargs=[],
+                            args=[self.sync(ast3.arg(arg=iter_name))],
+                            kwonlyargs=[],
+                            kw_defaults=[],
+                            defaults=[],
+                        )
+                    ),
+                    body=body,
                 )
-            ]
+            )
+        return None
 
     def exit_assign_compr(self, node: uni.AssignCompr) -> None:
         keys = []
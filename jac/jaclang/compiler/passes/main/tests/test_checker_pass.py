@@ -1,9 +1,15 @@
 """Tests for typechecker pass (the pyright implementation)."""
 
+import sys
 from collections.abc import Callable
+from pathlib import Path
 
+import pytest
+
+from jaclang.compiler import stub_cache
 from jaclang.compiler.passes.main import TypeCheckPass
 from jaclang.compiler.program import JacProgram
+from jaclang.settings import settings
 
 
 def _assert_error_pretty_found(needle: str, haystack: str) -> None:
@@ -813,3 +819,34 @@ def test_agentvisitor_connect_no_errors(fixture_path: Callable[[str], str]) -> N
     TypeCheckPass(ir_in=mod, prog=program)
     assert len(program.errors_had) == 0
     assert len(program.warnings_had) == 0
+
+
+def test_stub_cache_reused(
+    fixture_path: Callable[[str], str],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that cached builtin stubs give the same diagnostics as parsing them."""
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+    monkeypatch.setattr(settings, "bytecode_cache", True)
+    cache_file = tmp_path / "stubs.pickle"
+    monkeypatch.setattr(stub_cache, "cache_path", lambda: str(cache_file))
+
+    def check() -> list[str]:
+        program = JacProgram()
+        mod = program.compile(fixture_path("checker_float.jac"))
+        TypeCheckPass(ir_in=mod, prog=program)
+        return [err.pretty_print() for err in program.errors_had]
+
+    expected = check()
+    assert cache_file.exists()
+
+    def no_parse(*args: object, **kwargs: object) -> None:
+        raise AssertionError("stubs should not be parsed on a cache hit")
+
+    with monkeypatch.context() as m:
+        m.setattr(
+            "jaclang.compiler.type_system.type_evaluator.TypeEvaluator._load_stub_module",
+            no_parse,
+        )
+        assert check() == expected
@@ -281,6 +281,52 @@ def test_string_literal_import_works_with_cl() -> None:
     )
 
 
+def test_edge_paths_compile_to_plans() -> None:
+    """Test that edge paths with module level filters become shared plans."""
+    code = """
+glob limit = 1;
+node N { has v: int = 0; }
+edge E { has x: int = 0; }
+walker W {
+    can go with `root entry {
+        k = 2;
+        a = [->:E:x > limit:-> (`?N)];
+        b = [->:E:x > k:->];
+        visit [-->];
+    }
+}
+"""
+    prog = JacProgram()
+    out = prog.compile(file_path="paths.jac", use_str=code)
+    assert not prog.errors_had
+    assert (
+        "_jac_path_0 = OPlan(lambda: OPath([]).edge_out("
+        "edge=lambda i: i.x > limit, edge_type=E, node_type=N))"
+    ) in out.gen.py
+    assert "_jac_path_1 = OPlan(lambda: OPath([]).edge_out().visit())" in out.gen.py
+    assert "a = refs(_jac_path_0, here)" in out.gen.py
+    assert "b = refs(OPath(here).edge_out(edge=lambda i: i.x > k" in out.gen.py
+    assert "visit(self, refs(_jac_path_1, here))" in out.gen.py
+
+
+def test_edge_paths_reading_walrus_locals_stay_inline() -> None:
+    """Test that a filter reading a walrus-bound local is not hoisted."""
+    code = """
+glob limit = 1;
+edge E { has x: int = 0; }
+def f() {
+    if (limit := 10) {
+        print([root ->:E:x > limit:->]);
+    }
+}
+"""
+    prog = JacProgram()
+    out = prog.compile(file_path="walrus_paths.jac", use_str=code)
+    assert not prog.errors_had
+    assert "_jac_path_" not in out.gen.py
+    assert "refs(OPath(root()).edge_out(edge=lambda i: i.x > limit" in out.gen.py
+
+
 def parent_scrub(node: uni.UniNode) -> bool:
     """Validate every node has parent."""
     success = True
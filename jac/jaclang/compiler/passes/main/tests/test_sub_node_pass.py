@@ -1,7 +1,11 @@
 """Test sub node pass module."""
 
+import sys
 from collections.abc import Callable
+from pathlib import Path
+from types import FrameType
 
+import jaclang.compiler.unitree as uni
 from jaclang.compiler.passes import UniPass
 from jaclang.compiler.program import JacProgram
 
@@ -11,8 +15,126 @@ def test_sub_node_pass(examples_path: Callable[[str], str]) -> None:
     code_gen = (out := JacProgram()).compile(
         file_path=examples_path("manual_code/circle.jac")
     )
+
+    def walk(node: uni.UniNode, out: list[uni.UniNode]) -> list[uni.UniNode]:
+        for kid in node.kid:
+            walk(kid, out).append(kid)
+        return out
+
     for i in code_gen.kid[1].kid:
-        for k, v in i._sub_node_tab.items():
-            for n in v:
-                assert n in UniPass.get_all_sub_nodes(i, k, brute_force=True)
+        sub_nodes = walk(i, [])
+        for typ in {type(n) for n in sub_nodes}:
+            assert UniPass.get_all_sub_nodes(i, typ) == [
+                n for n in sub_nodes if type(n) is typ
+            ]
     assert not out.errors_had
+
+
+def test_sub_node_index_invalidation(examples_path: Callable[[str], str]) -> None:
+    """Test that replacing a kid list refreshes sub node queries."""
+    mod = JacProgram().compile(file_path=examples_path("manual_code/circle.jac"))
+    names = mod.get_all_sub_nodes(uni.Name)
+    assert names
+    index = mod.sub_node_index()
+    assert mod.sub_node_index() is index
+
+    def walk(node: uni.UniNode, out: list[uni.UniNode]) -> list[uni.UniNode]:
+        for kid in node.kid:
+            walk(kid, out).append(kid)
+        return out
+
+    def check() -> None:
+        for node in [mod, *walk(mod, [])]:
+            for typ in (uni.Name, uni.Token, uni.Ability):
+                assert node.get_all_sub_nodes(typ) == [
+                    n for n in walk(node, []) if type(n) is typ
+                ]
+
+    # Edits renumber only the edited subtree, including nested edits.
+    target = names[0]
+    parent = target.parent
+    assert parent is not None and parent.parent is not None
+    parent.kid = [kid for kid in parent.kid if kid is not target]
+    assert mod.sub_node_index() is index
+    assert target not in mod.get_all_sub_nodes(uni.Name)
+    assert len(mod.get_all_sub_nodes(uni.Name)) == len(names) - 1
+    check()
+    moved = names[-1]
+    assert moved.parent is not None
+    moved.parent.kid = [kid for kid in moved.parent.kid if kid is not moved]
+    parent.parent.kid = [*parent.parent.kid, moved]
+    check()
+    ability = mod.get_all_sub_nodes(uni.Ability)[0]
+    ability.kid = list(ability.kid)
+    check()
+    assert mod.sub_node_index() is index
+
+    # Wrapping a node re-parents it with set_parent before the old parent's
+    # kid list is replaced.
+    name = mod.get_all_sub_nodes(uni.Name)[-1]
+    old = name.parent
+    assert old is not None
+    wrapper = uni.SubTag(tag=name, kid=[name])
+    check()
+    old.kid = [wrapper if kid is name else kid for kid in old.kid]
+    wrapper.set_parent(old)
+    check()
+    assert mod.sub_node_index() is index
+
+
+def test_traverse_is_iterative(tmp_path: Path) -> None:
+    """Test pass traversal order, pruning and depth beyond the recursion limit."""
+    depth = 300
+    src = tmp_path / "deep.jac"
+    src.write_text("with entry { x = " + "-" * depth + "1; }\n")
+    prog = JacProgram()
+    mod = prog.compile(str(src))
+    assert not prog.errors_had
+
+    class Recorder(UniPass):
+        def before_pass(self) -> None:
+            self.events: list[tuple[str, uni.UniNode]] = []
+
+        def enter_node(self, node: uni.UniNode) -> None:
+            self.events.append(("enter", node))
+            super().enter_node(node)
+
+        def exit_node(self, node: uni.UniNode) -> None:
+            self.events.append(("exit", node))
+            super().exit_node(node)
+
+        def enter_unary_expr(self, node: uni.UnaryExpr) -> None:
+            if node.parent and isinstance(node.parent, uni.UnaryExpr):
+                self.prune()
+
+    def walk(node: uni.UniNode, out: list[tuple[str, uni.UniNode]]) -> None:
+        out.append(("enter", node))
+        if not (
+            isinstance(node, uni.UnaryExpr) and isinstance(node.parent, uni.UnaryExpr)
+        ):
+            for kid in node.kid:
+                walk(kid, out)
+        out.append(("exit", node))
+
+    expected: list[tuple[str, uni.UniNode]] = []
+    walk(mod, expected)
+    assert Recorder(ir_in=mod, prog=prog).events == expected
+
+    class Counter(UniPass):
+        def before_pass(self) -> None:
+            self.unary = 0
+
+        def exit_unary_expr(self, node: uni.UnaryExpr) -> None:
+            self.unary += 1
+
+    limit = sys.getrecursionlimit()
+    frame: FrameType | None = sys._getframe()
+    stack_depth = 0
+    while frame:
+        frame, stack_depth = frame.f_back, stack_depth + 1
+    sys.setrecursionlimit(stack_depth + 100)
+    try:
+        counter = Counter(ir_in=mod, prog=prog)
+    finally:
+        sys.setrecursionlimit(limit)
+    assert counter.unary == depth
@@ -2,21 +2,46 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterator
 from threading import Event
-from typing import TYPE_CHECKING, TypeVar
+from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
 
 import jaclang.compiler.unitree as uni
 from jaclang.compiler.passes.transform import Transform
+from jaclang.utils.helpers import pascal_to_snake
 
 if TYPE_CHECKING:
     from jaclang.compiler.program import JacProgram
 
 T = TypeVar("T", bound=uni.UniNode)
 
+Handler = Callable[[Any, uni.UniNode], None]
+
 
 class UniPass(Transform[uni.Module, uni.Module]):
     """Abstract class for IR passes."""
 
+    # enter_<node>/exit_<node> handlers of this pass class, by node type.
+    _handlers: ClassVar[dict[type[uni.UniNode], tuple[Handler | None, ...]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:  # noqa: ANN401
+        """Give each pass class its own handler table."""
+        super().__init_subclass__(**kwargs)
+        cls._handlers = {}
+
+    @classmethod
+    def node_handlers(cls, node_type: type[uni.UniNode]) -> tuple[Handler | None, ...]:
+        """Return the enter and exit handlers of a node type."""
+        handlers = cls._handlers.get(node_type)
+        if handlers is None:
+            name = pascal_to_snake(node_type.__name__)
+            handlers = (
+                getattr(cls, f"enter_{name}", None),
+                getattr(cls, f"exit_{name}", None),
+            )
+            cls._handlers[node_type] = handlers
+        return handlers
+
     def __init__(
         self,
         ir_in: uni.Module,
@@ -36,46 +61,31 @@ class UniPass(Transform[uni.Module, uni.Module]):
 
     def enter_node(self, node: uni.UniNode) -> None:
         """Run on entering node."""
-        from jaclang.utils.helpers import pascal_to_snake
-
-        if hasattr(self, f"enter_{pascal_to_snake(type(node).__name__)}"):
-            getattr(self, f"enter_{pascal_to_snake(type(node).__name__)}")(node)
+        handlers = self._handlers.get(type(node)) or self.node_handlers(type(node))
+        handler = handlers[0]
+        if handler is not None:
+            handler(self, node)
 
     def exit_node(self, node: uni.UniNode) -> None:
         """Run on exiting node."""
-        from jaclang.utils.helpers import pascal_to_snake
-
-        if hasattr(self, f"exit_{pascal_to_snake(type(node).__name__)}"):
-            getattr(self, f"exit_{pascal_to_snake(type(node).__name__)}")(node)
+        handlers = self._handlers.get(type(node)) or self.node_handlers(type(node))
+        handler = handlers[1]
+        if handler is not None:
+            handler(self, node)
 
     def prune(self) -> None:
         """Prune traversal."""
         self.prune_signal = True
 
     @staticmethod
-    def get_all_sub_nodes(
-        node: uni.UniNode, typ: type[T], brute_force: bool = False
-    ) -> list[T]:
-        """Get all sub nodes of type."""
-        result: list[T] = []
-        # Assumes pass built the sub node table
+    def get_all_sub_nodes(node: uni.UniNode, typ: type[T]) -> list[T]:
+        """Get all sub nodes of type.
+
+        Only nodes whose type is exactly typ are returned, in post-order.
+        """
         if not node:
-            return result
-        elif len(node._sub_node_tab):
-            if typ in node._sub_node_tab:
-                for i in node._sub_node_tab[typ]:
-                    if isinstance(i, typ):
-                        result.append(i)
-        elif len(node.kid):
-            if not brute_force:
-                raise ValueError(f"Node has no sub_node_tab. {node}")
-            # Brute force search
-            else:
-                for i in node.kid:
-                    if isinstance(i, typ):
-                        result.append(i)
-                    result.extend(UniPass.get_all_sub_nodes(i, typ, brute_force))
-        return result
+            return []
+        return node.sub_node_index().sub_nodes(node, typ)
 
     @staticmethod
     def find_parent_of_type(node: uni.UniNode, typ: type[T]) -> T | None:
@@ -120,19 +130,35 @@ class UniPass(Transform[uni.Module, uni.Module]):
         return self.ir_in
 
     def traverse(self, node: uni.UniNode) -> uni.UniNode:
-        """Traverse tree."""
-        if self.is_canceled():
-            return node
-        self.cur_node = node
-        self.enter_node(node)
-        if not self.prune_signal:
-            for i in node.kid:
-                if i:
-                    self.traverse(i)
-        else:
-            self.prune_signal = False
-        self.cur_node = node
-        if self.is_canceled():
-            return node
-        self.exit_node(node)
-        return node
+        """Traverse tree.
+
+        Nodes are visited depth first with an explicit stack, so deeply
+        nested trees don't run into the recursion limit.
+        """
+        stack: list[tuple[uni.UniNode, Iterator[uni.UniNode | None]]] = []
+        cur: uni.UniNode | None = node
+        while True:
+            if cur is not None:
+                if self.is_canceled():
+                    return node
+                self.cur_node = cur
+                self.enter_node(cur)
+                if not self.prune_signal:
+                    stack.append((cur, iter(cur.kid)))
+                else:
+                    self.prune_signal = False
+                    stack.append((cur, iter(())))
+            parent, kids = stack[-1]
+            for cur in kids:
+                if cur:
+                    break
+            else:
+                cur = None
+            if cur is None:
+                stack.pop()
+                self.cur_node = parent
+                if self.is_canceled():
+                    return node
+                self.exit_node(parent)
+                if not stack:
+                    return node
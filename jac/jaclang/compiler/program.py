@@ -4,11 +4,13 @@ from __future__ import annotations
 
 import ast as py_ast
 import marshal
+import os
 import types
 from threading import Event
 from typing import TYPE_CHECKING
 
 import jaclang.compiler.unitree as uni
+from jaclang.compiler import bytecode_cache
 from jaclang.compiler.parser import JacParser
 from jaclang.compiler.passes.main import (
     Alert,
@@ -22,6 +24,7 @@ from jaclang.compiler.passes.main import (
 # Tool passes are imported lazily to allow doc_ir.py to be converted to Jac
 from jaclang.compiler.tsparser import TypeScriptParser
 from jaclang.compiler.utils import read_file_with_encoding
+from jaclang.settings import settings
 
 if TYPE_CHECKING:
     from jaclang.compiler.type_system.type_evaluator import TypeEvaluator
@@ -134,12 +137,49 @@ class JacProgram:
             full_target: The full path to the module file.
             minimal: If True, use minimal compilation (no JS/type analysis).
                      This avoids circular imports for bootstrap-critical modules.
+
+        Jac modules are looked up in the on-disk bytecode cache before being
+        compiled, and cleanly compiled modules are written back to it.
         """
         if full_target in self.mod.hub and self.mod.hub[full_target].gen.py_bytecode:
             codeobj = self.mod.hub[full_target].gen.py_bytecode
             return marshal.loads(codeobj) if isinstance(codeobj, bytes) else None
+        cache_key = None
+        if settings.bytecode_cache and full_target.endswith(".jac"):
+            cache_key = bytecode_cache.source_key(full_target, minimal)
+            if cache_key and (
+                cached := bytecode_cache.load(full_target, minimal, cache_key)
+            ):
+                return cached
+        err_start, warn_start = len(self.errors_had), len(self.warnings_had)
         result = self.compile(file_path=full_target, minimal=minimal)
-        return marshal.loads(result.gen.py_bytecode) if result.gen.py_bytecode else None
+        if not result.gen.py_bytecode:
+            return None
+        # Modules with alerts are not cached so they are reported on every run
+        if (
+            cache_key
+            and len(self.errors_had) == err_start
+            and len(self.warnings_had) == warn_start
+        ):
+            bytecode_cache.store(
+                full_target, minimal, cache_key, result.gen.py_bytecode
+            )
+        return marshal.loads(result.gen.py_bytecode)
+
+    def get_module(self, file_path: str) -> uni.Module | None:
+        """Get the compiled module for a file, compiling it if not in the hub.
+
+        Modules loaded from the bytecode cache never go through the compiler,
+        so consumers that need a module's AST or manifest use this instead of
+        reading the hub directly.
+        """
+        if (
+            file_path not in self.mod.hub
+            and file_path.endswith(".jac")
+            and os.path.isfile(file_path)
+        ):
+            self.compile(file_path)
+        return self.mod.hub.get(file_path)
 
     def parse_str(
         self, source_str: str, file_path: str, cancel_token: Event | None = None
@@ -0,0 +1,101 @@
+"""On-disk cache of the stub modules loaded by every type evaluator.
+
+Each TypeEvaluator starts by parsing the typing, types, builtins and Jac
+builtins stubs and building their symbol tables. The processed modules are
+pickled together into a ``__jac_cache__`` directory next to this file. The
+entry is keyed on the compiler fingerprint and the stub sources, so editing
+either of them rebuilds it.
+
+Types the evaluator has already computed for stub nodes are left out of the
+entry. They are cached on the nodes lazily and get evaluated again on use, and
+their classes live in a Jac module that may be reloaded within a process.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import io
+import os
+import pickle
+import sys
+from typing import Any
+
+from jaclang.compiler import unitree as uni
+from jaclang.compiler.bytecode_cache import CACHE_DIR, compiler_fingerprint
+from jaclang.utils.log import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT = b"JACST002"
+TYPES_MODULE = "jaclang.compiler.type_system.types"
+
+
+class StubPickler(pickle.Pickler):
+    """Pickler that stores evaluated types as None."""
+
+    def reducer_override(self, obj: Any) -> Any:  # noqa: ANN401
+        """Reduce type system objects to None."""
+        if type(obj).__module__ == TYPES_MODULE:
+            return (type(None), ())
+        return NotImplemented
+
+
+def cache_path() -> str:
+    """Return the path of the stub cache file."""
+    name = f"stubs.{sys.implementation.cache_tag}.pickle"
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), CACHE_DIR, name)
+
+
+def stubs_key(stub_paths: list[str]) -> bytes | None:
+    """Return the cache key of a set of stubs, or None if one can't be read."""
+    digest = hashlib.sha256(compiler_fingerprint())
+    try:
+        for path in stub_paths:
+            with open(path, "rb") as f:
+                data = f.read()
+            digest.update(f"{os.path.abspath(path)}:{len(data)}:".encode())
+            digest.update(data)
+    except OSError:
+        return None
+    return digest.digest()
+
+
+def load(key: bytes) -> list[uni.Module] | None:
+    """Return the cached stub modules if they match the key."""
+    try:
+        with open(cache_path(), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    header = CACHE_FORMAT + key
+    if not data.startswith(header):
+        return None
+    try:
+        modules = pickle.loads(data[len(header) :])
+    except Exception:
+        return None
+    return modules if isinstance(modules, list) else None
+
+
+def store(key: bytes, modules: list[uni.Module]) -> None:
+    """Write the stub modules to the cache.
+
+    As with the bytecode cache, the entry is written to a temporary path and
+    moved into place. Failures leave the cache unwritten and are logged.
+    """
+    if sys.dont_write_bytecode:
+        return
+    path = cache_path()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        buffer = io.BytesIO()
+        StubPickler(buffer, pickle.HIGHEST_PROTOCOL).dump(modules)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(CACHE_FORMAT + key + buffer.getvalue())
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError, RecursionError) as e:
+        logger.warning(f"Could not write the stub cache {path}: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
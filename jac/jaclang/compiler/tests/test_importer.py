@@ -214,3 +214,36 @@ def test_jac_import_py_files(fixture_abs_path: Callable[[str], str]) -> None:
         )
     finally:
         os.chdir(original_cwd)
+
+
+def test_bytecode_cache_skips_compiler(
+    tmp_path: "os.PathLike[str]", monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that cached bytecode is reused and invalidated by annex changes."""
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+    monkeypatch.setattr(settings, "bytecode_cache", True)
+    mod_path = os.path.join(tmp_path, "cached_mod.jac")
+    impl_path = os.path.join(tmp_path, "cached_mod.impl.jac")
+    with open(mod_path, "w") as f:
+        f.write("def value() -> int;\nwith entry { result = value(); }\n")
+    with open(impl_path, "w") as f:
+        f.write("impl value() -> int { return 1; }\n")
+
+    def run_module(prog: JacProgram) -> object:
+        namespace: dict[str, object] = {}
+        exec(prog.get_bytecode(mod_path), namespace)  # type: ignore[arg-type]
+        return namespace["result"]
+
+    assert run_module(JacProgram()) == 1
+    assert os.path.isdir(os.path.join(tmp_path, "__jac_cache__"))
+
+    def no_compile(*args: object, **kwargs: object) -> None:
+        raise AssertionError("compiler should not run on a cache hit")
+
+    with monkeypatch.context() as m:
+        m.setattr(JacProgram, "compile", no_compile)
+        assert run_module(JacProgram()) == 1
+
+    with open(impl_path, "w") as f:
+        f.write("impl value() -> int { return 2; }\n")
+    assert run_module(JacProgram()) == 2
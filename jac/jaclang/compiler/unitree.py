@@ -5,8 +5,8 @@ from __future__ import annotations
 import ast as ast3
 import builtins
 import os
+from bisect import bisect_left
 from collections.abc import Callable, Sequence
-from copy import copy
 from dataclasses import dataclass, field
 from enum import IntEnum
 from hashlib import md5
@@ -49,15 +49,120 @@ from jaclang.utils.treeprinter import (
 )
 
 
+class SubNodeIndex:
+    """Index of the nodes under a tree root, by type.
+
+    Nodes are numbered in post-order, so the descendants of any node occupy
+    the positions just before its own. The sorted positions of each node
+    type then answer sub node queries with two bisections. The index is kept
+    on the root of the tree. Assigning a kid list marks that node as
+    replaced: its subtree gets an index of its own, which queries over the
+    rest of the tree splice in, so only the edited subtree is renumbered.
+    """
+
+    def __init__(self, root: UniNode) -> None:
+        """Number the nodes under root."""
+        self.nodes: list[UniNode] = []
+        self.first: list[int] = []
+        self.position: dict[int, int] = {}
+        self.by_type: dict[type, list[int]] = {}
+        # Sorted positions of replaced nodes, none of them inside another.
+        self.replaced: list[int] = []
+        nodes, first, position, by_type = (
+            self.nodes,
+            self.first,
+            self.position,
+            self.by_type,
+        )
+        stack: list[tuple[UniNode, int]] = [(root, -1)]
+        while stack:
+            node, start = stack.pop()
+            if start < 0:
+                stack.append((node, len(nodes)))
+                stack.extend([(i, -1) for i in reversed(node.kid) if i])
+                continue
+            if node is not root:
+                # Indexes of replaced subtrees are superseded by this one.
+                node._sub_node_index = None
+            pos = len(nodes)
+            nodes.append(node)
+            first.append(start)
+            position[id(node)] = pos
+            if (positions := by_type.get(type(node))) is None:
+                by_type[type(node)] = [pos]
+            else:
+                positions.append(pos)
+
+    def __reduce__(self) -> tuple[type[None], tuple[()]]:
+        """Copy or pickle as None, since positions are keyed by object id."""
+        return (type(None), ())
+
+    def covers(self, node: UniNode) -> bool:
+        """Check if node is in the indexed tree."""
+        pos = self.position.get(id(node))
+        return pos is not None and self.nodes[pos] is node
+
+    def is_replaced(self, node: UniNode) -> bool:
+        """Check if the subtree of a covered node has an index of its own."""
+        pos = self.position[id(node)]
+        i = bisect_left(self.replaced, pos)
+        return i < len(self.replaced) and self.replaced[i] == pos
+
+    def replace(self, node: UniNode) -> None:
+        """Hand the subtree of a covered node over to an index of its own."""
+        pos = self.position[id(node)]
+        start = bisect_left(self.replaced, self.first[pos])
+        end = bisect_left(self.replaced, pos, start)
+        for inner in self.replaced[start:end]:
+            self.nodes[inner]._sub_node_index = None
+        if end == len(self.replaced) or self.replaced[end] != pos:
+            self.replaced[start:end] = [pos]
+        else:
+            del self.replaced[start:end]
+        node._sub_node_index = None
+
+    def sub_nodes(self, node: UniNode, typ: type[T]) -> list[T]:
+        """Return the descendants of node whose type is exactly typ."""
+        positions = self.by_type.get(typ, [])
+        pos = self.position[id(node)]
+        low = self.first[pos]
+        result: list[T] = []
+        start = bisect_left(self.replaced, low)
+        for rep in self.replaced[start : bisect_left(self.replaced, pos, start)]:
+            result.extend(self._span(positions, low, self.first[rep]))
+            sub = self.nodes[rep]
+            result.extend(sub.sub_node_index().sub_nodes(sub, typ))
+            low = rep
+        result.extend(self._span(positions, low, pos))
+        return result
+
+    def _span(self, positions: list[int], low: int, high: int) -> list[T]:
+        """Return the nodes at the positions in [low, high)."""
+        start = bisect_left(positions, low)
+        end = bisect_left(positions, high, start)
+        return [cast(T, self.nodes[i]) for i in positions[start:end]]
+
+
 class UniNode:
     """Abstract syntax tree node for Jac."""
 
+    # Node types don't declare slots of their own, so they keep a __dict__
+    # for their fields; these are the attributes every node has.
+    __slots__ = (
+        "__dict__",
+        "__weakref__",
+        "parent",
+        "_kid",
+        "_sub_node_index",
+        "_gen",
+        "loc",
+    )
+
     def __init__(self, kid: Sequence[UniNode]) -> None:
         """Initialize ast."""
         self.parent: UniNode | None = None
-        self.kid: list[UniNode] = [x.set_parent(self) for x in kid]
-        self.__sub_node_tab: dict[type, list[UniNode]] | None = None
-        self._in_mod_nodes: list[UniNode] = []
+        self._sub_node_index: SubNodeIndex | None = None
+        self._kid: list[UniNode] = [x.set_parent(self) for x in kid]
         self._gen: CodeGenTarget | None = None
         self.loc: CodeLocInfo = CodeLocInfo(*self.resolve_tok_range())
 
@@ -74,27 +179,66 @@ class UniNode:
         self._gen = value
 
     @property
-    def _sub_node_tab(self) -> dict[type, list[UniNode]]:
-        """Lazy initialization of sub node table."""
-        if self.__sub_node_tab is None:
-            self.__sub_node_tab = {}
-            self._construct_sub_node_tab()
-        return self.__sub_node_tab
-
-    def _construct_sub_node_tab(self) -> None:
-        """Construct sub node table."""
-        for i in self.kid:
-            if not i:
+    def kid(self) -> list[UniNode]:
+        """Get kids."""
+        return self._kid
+
+    @kid.setter
+    def kid(self, kid: list[UniNode]) -> None:
+        """Set kids, renumbering only this node's subtree in the sub node index.
+
+        Kid lists are only changed by assigning a new list, which keeps the
+        index from going stale.
+        """
+        self._kid = kid
+        self._kids_changed()
+
+    def _kids_changed(self) -> None:
+        """Drop the indexed descendants of this node."""
+        index = self._covering_index(build=False)
+        if index is None or self.parent is None:
+            self._sub_node_index = None
+        else:
+            index.replace(self)
+
+    def _covering_index(self, build: bool) -> SubNodeIndex | None:
+        """Return the index numbering this node, or None if there is none.
+
+        The walk starts at the root's index and moves into the index of each
+        replaced ancestor. Missing indexes are built only if build is set.
+        """
+        path: list[UniNode] = [self]
+        while (parent := path[-1].parent) is not None:
+            path.append(parent)
+        root = path.pop()
+        if (index := root._sub_node_index) is None:
+            if not build:
+                return None
+            index = root._sub_node_index = SubNodeIndex(root)
+        for node in reversed(path):
+            if not index.covers(node):
+                return None
+            if node is self or not index.is_replaced(node):
                 continue
-            for k, v in i._sub_node_tab.items():
-                if k in self.__sub_node_tab:  # type: ignore
-                    self.__sub_node_tab[k].extend(v)  # type: ignore
-                else:
-                    self.__sub_node_tab[k] = copy(v)  # type: ignore
-            if type(i) in self.__sub_node_tab:  # type: ignore
-                self.__sub_node_tab[type(i)].append(i)  # type: ignore
-            else:
-                self.__sub_node_tab[type(i)] = [i]  # type: ignore
+            if (sub := node._sub_node_index) is None:
+                if not build:
+                    return None
+                sub = node._sub_node_index = SubNodeIndex(node)
+            index = sub
+        return index
+
+    def sub_node_index(self) -> SubNodeIndex:
+        """Return an index covering this node and its descendants."""
+        index = self._covering_index(build=True)
+        if index is not None and (
+            self.parent is None or not index.is_replaced(self)
+        ):
+            return index
+        # The subtree was replaced, or the parent links lead to a tree that
+        # doesn't contain this node.
+        if self._sub_node_index is None:
+            self._sub_node_index = SubNodeIndex(self)
+        return self._sub_node_index
 
     @property
     def sym_tab(self) -> UniScopeNode:
@@ -159,8 +303,12 @@ class UniNode:
         return self
 
     def set_parent(self, parent: UniNode) -> UniNode:
-        """Set parent."""
-        self.parent = parent
+        """Set parent, dropping the indexed descendants of both parents."""
+        if (old := self.parent) is not parent:
+            self.parent = parent
+            if old is not None:
+                old._kids_changed()
+            parent._kids_changed()
         return self
 
     def resolve_tok_range(self) -> tuple[Token, Token]:
@@ -196,11 +344,11 @@ class UniNode:
             pos_end=0,
         )
 
-    def get_all_sub_nodes(self, typ: type[T], brute_force: bool = True) -> list[T]:
+    def get_all_sub_nodes(self, typ: type[T]) -> list[T]:
         """Get all sub nodes of type."""
         from jaclang.compiler.passes import UniPass
 
-        return UniPass.get_all_sub_nodes(node=self, typ=typ, brute_force=brute_force)
+        return UniPass.get_all_sub_nodes(node=self, typ=typ)
 
     def find_parent_of_type(self, typ: type[T]) -> T | None:
         """Get parent of type."""
@@ -984,6 +1132,7 @@ class Module(AstDocNode, UniScopeNode):
         self.test_mod: list[Module] = []
         self.src_terminals: list[Token] = terminals
         self.is_raised_from_py: bool = False
+        self._in_mod_nodes: list[UniNode] = []
 
         # We continue to parse a module even if there are syntax errors
         # so that we can report more errors in a single pass and support
@@ -5038,6 +5187,18 @@ class MatchArch(MatchPattern):
 class Token(UniNode):
     """Token node type for Jac Ast."""
 
+    __slots__ = (
+        "orig_src",
+        "name",
+        "value",
+        "line_no",
+        "end_line",
+        "c_start",
+        "c_end",
+        "pos_start",
+        "pos_end",
+    )
+
     def __init__(
         self,
         orig_src: Source,
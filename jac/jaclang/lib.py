@@ -17,6 +17,7 @@ __all__ = [
     "Root",
     "GenericEdge",
     "OPath",
+    "OPlan",
     "DSFunc",
     # Common runtime methods
     "root",
@@ -34,6 +35,7 @@ if TYPE_CHECKING:
     from jaclang.runtimelib.archetype import GenericEdge, Root
     from jaclang.runtimelib.archetype import ObjectSpatialFunction as DSFunc
     from jaclang.runtimelib.archetype import ObjectSpatialPath as OPath
+    from jaclang.runtimelib.archetype import ObjectSpatialPlan as OPlan
     from jaclang.runtimelib.constructs import Archetype as Obj
     from jaclang.runtimelib.constructs import EdgeArchetype as Edge
     from jaclang.runtimelib.constructs import NodeArchetype as Node
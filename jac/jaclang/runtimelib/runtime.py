@@ -2,25 +2,41 @@
 
 from __future__ import annotations
 
+import asyncio
 import fnmatch
+import heapq
 import html
 import inspect
+import io
+import itertools
 import os
 import sys
+import threading
 import types
-from collections import OrderedDict
-from collections.abc import Callable, Coroutine, Mapping, Sequence
+from collections import OrderedDict, deque
+from collections.abc import (
+    Callable,
+    Coroutine,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
 from concurrent.futures import Future
+from contextvars import ContextVar, copy_context
 from dataclasses import MISSING, dataclass, field
 from functools import wraps
 from inspect import getfile
 from logging import getLogger
+from operator import itemgetter
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Any,
+    ClassVar,
     Literal,
     ParamSpec,
+    TextIO,
     TypeAlias,
     TypeVar,
     cast,
@@ -30,8 +46,10 @@ from uuid import UUID
 
 from jaclang.compiler.constant import Constants as Con
 from jaclang.compiler.constant import EdgeDir, colors
+from jaclang.settings import settings
 from jaclang.utils import infer_language
 from jaclang.vendor import pluggy
+from jaclang.vendor.pluggy._callers import _multicall
 
 # Flag to track if lazy imports have been initialized
 _lazy_imports_initialized = False
@@ -46,6 +64,7 @@ if TYPE_CHECKING:
         ObjectSpatialDestination,
         ObjectSpatialFunction,
         ObjectSpatialPath,
+        ObjectSpatialPlan,
     )
     from jaclang.runtimelib.client_bundle import ClientBundle, ClientBundleBuilder
     from jaclang.runtimelib.constructs import (
@@ -61,17 +80,17 @@ if TYPE_CHECKING:
         WalkerAnchor,
         WalkerArchetype,
     )
-    from jaclang.runtimelib.memory import Memory, Shelf, ShelfStorage
+    from jaclang.runtimelib.memory import Memory, StoragePool, open_memory
     from jaclang.runtimelib.mtp import MTIR
     from jaclang.runtimelib.server import ModuleIntrospector
 else:
     # Module-level placeholders for lazy imports (populated by _init_lazy_imports)
     AccessLevel = Anchor = Archetype = EdgeAnchor = EdgeArchetype = GenericEdge = None  # type: ignore
     NodeAnchor = NodeArchetype = Root = WalkerAnchor = WalkerArchetype = None  # type: ignore
-    Memory = Shelf = ShelfStorage = MTIR = None  # type: ignore
+    Memory = open_memory = MTIR = None  # type: ignore
     _GenericEdge = _Root = ObjectSpatialDestination = ObjectSpatialFunction = (
         ObjectSpatialPath
-    ) = None  # type: ignore
+    ) = ObjectSpatialPlan = None  # type: ignore
 
 
 def _init_lazy_imports() -> None:
@@ -83,13 +102,14 @@ def _init_lazy_imports() -> None:
     global _lazy_imports_initialized
     global AccessLevel, Anchor, Archetype, EdgeAnchor, EdgeArchetype, GenericEdge
     global NodeAnchor, NodeArchetype, Root, WalkerAnchor, WalkerArchetype
-    global Memory, Shelf, ShelfStorage, MTIR
+    global Memory, open_memory, MTIR
     global \
         _GenericEdge, \
         _Root, \
         ObjectSpatialDestination, \
         ObjectSpatialFunction, \
-        ObjectSpatialPath
+        ObjectSpatialPath, \
+        ObjectSpatialPlan
 
     if _lazy_imports_initialized:
         return
@@ -111,6 +131,7 @@ def _init_lazy_imports() -> None:
             ObjectSpatialDestination,
             ObjectSpatialFunction,
             ObjectSpatialPath,
+            ObjectSpatialPlan,
         )
         from jaclang.runtimelib.archetype import (
             Root as _Root,
@@ -128,7 +149,7 @@ def _init_lazy_imports() -> None:
             WalkerAnchor,
             WalkerArchetype,
         )
-        from jaclang.runtimelib.memory import Memory, Shelf, ShelfStorage
+        from jaclang.runtimelib.memory import Memory, open_memory
         from jaclang.runtimelib.mtp import MTIR
 
         _lazy_imports_initialized = True
@@ -183,7 +204,111 @@ class _LazyThreadPoolDescriptor:
         _LazyThreadPoolDescriptor._instance = value
 
 
-plugin_manager = pluggy.PluginManager("jac")
+class JacPluginManager(pluggy.PluginManager):
+    """Plugin manager that binds single-implementation hooks to direct calls.
+
+    Proxy methods ask `direct_call` for a plain function before going through
+    pluggy. A hook resolves to its implementation function only when calling it
+    directly is indistinguishable from a pluggy call: exactly one non-wrapper
+    implementation, the same parameters and defaults as the interface, and no
+    hook call monitoring installed. The bindings are rebuilt lazily whenever
+    plugins or hookspecs change.
+    """
+
+    def __init__(self, project_name: str) -> None:
+        """Initialize the plugin manager."""
+        super().__init__(project_name)
+        self.direct_dispatch: bool = True
+        self._direct_calls: dict[str, Callable | None] = {}
+        self._interface_funcs: dict[str, Callable] = {}
+
+    def set_direct_dispatch(self, enabled: bool) -> None:
+        """Enable or disable direct calls for single-implementation hooks."""
+        self.direct_dispatch = enabled
+        self._direct_calls.clear()
+
+    def register(self, plugin: object, name: str | None = None) -> str | None:
+        """Register a plugin and invalidate direct call bindings."""
+        try:
+            return super().register(plugin, name)
+        finally:
+            self._direct_calls.clear()
+
+    def unregister(
+        self, plugin: object | None = None, name: str | None = None
+    ) -> Any | None:  # noqa: ANN401
+        """Unregister a plugin and invalidate direct call bindings."""
+        try:
+            return super().unregister(plugin, name)
+        finally:
+            self._direct_calls.clear()
+
+    def add_hookspecs(self, module_or_class: types.ModuleType | type) -> None:
+        """Add hookspecs and invalidate direct call bindings."""
+        try:
+            super().add_hookspecs(module_or_class)
+        finally:
+            self._direct_calls.clear()
+
+    def add_hookcall_monitoring(
+        self, before: Callable[..., None], after: Callable[..., None]
+    ) -> Callable[[], None]:
+        """Add hook call monitoring, which disables direct calls until undone."""
+        undo = super().add_hookcall_monitoring(before, after)
+        self._direct_calls.clear()
+
+        def undo_monitoring() -> None:
+            undo()
+            self._direct_calls.clear()
+
+        return undo_monitoring
+
+    def register_interface(self, name: str, func: Callable) -> None:
+        """Record the interface function a hook's direct call must match."""
+        self._interface_funcs[name] = func
+        self._direct_calls.pop(name, None)
+
+    def direct_call(self, name: str) -> Callable | None:
+        """Return the function a hook can be called through directly, if any."""
+        try:
+            return self._direct_calls[name]
+        except KeyError:
+            func = self._direct_calls[name] = self._resolve_direct_call(name)
+            return func
+
+    def _resolve_direct_call(self, name: str) -> Callable | None:
+        """Resolve the direct call binding for a hook."""
+        hookcaller = getattr(self.hook, name, None)
+        interface = self._interface_funcs.get(name)
+        if (
+            not self.direct_dispatch
+            or hookcaller is None
+            or interface is None
+            or hookcaller.spec is None
+            or self._inner_hookexec is not _multicall
+        ):
+            return None
+        impls = hookcaller.get_hookimpls()
+        if len(impls) != 1:
+            return None
+        impl = impls[0]
+        func = impl.function
+        if (
+            impl.wrapper
+            or impl.hookwrapper
+            or impl.kwargnames
+            or impl.argnames != hookcaller.spec.argnames
+            or not inspect.isfunction(func)
+            or func.__code__.co_varnames[: func.__code__.co_argcount]
+            != interface.__code__.co_varnames[: interface.__code__.co_argcount]
+            or func.__defaults__ != interface.__defaults__
+            or func.__kwdefaults__ != interface.__kwdefaults__
+        ):
+            return None
+        return func
+
+
+plugin_manager = JacPluginManager("jac")
 hookspec = pluggy.HookspecMarker("jac")
 hookimpl = pluggy.HookimplMarker("jac")
 logger = getLogger(__name__)
@@ -199,16 +324,27 @@ StatusCode: TypeAlias = Literal[200, 201, 400, 401, 404, 500, 503]
 class ExecutionContext:
     """Execution Context."""
 
+    # Bumped by every permission change in this process, so that each context
+    # drops its access cache before its next check.
+    permission_generation: ClassVar[int] = 0
+    _generations: ClassVar[Iterator[int]] = itertools.count(1)
+
     def __init__(
         self,
         session: str | None = None,
         root: str | None = None,
+        pool: StoragePool | None = None,
     ) -> None:
         """Initialize JacRuntime."""
         _init_lazy_imports()  # Ensure lazy imports are loaded
-        self.mem: Memory = ShelfStorage(session)
+        self.mem: Memory = (
+            pool.view(session) if pool and session else open_memory(session)
+        )
         self.reports: list[Any] = []
         self.custom: Any = MISSING
+        # access levels already derived, by (requesting root id, target anchor id)
+        self.access_cache: dict[tuple[UUID, UUID], AccessLevel] = {}
+        self.access_generation = ExecutionContext.permission_generation
         system_root = self.mem.find_by_id(UUID(Con.SUPER_ROOT_UUID))
         if not isinstance(system_root, NodeAnchor):
             system_root = cast(NodeAnchor, Root().__jac__)
@@ -236,11 +372,31 @@ class ExecutionContext:
         """Close current ExecutionContext."""
         self.mem.close()
 
+    def get_access_cache(self) -> dict[tuple[UUID, UUID], AccessLevel]:
+        """Get the cached access levels, dropped if any permission changed."""
+        generation = ExecutionContext.permission_generation
+        if self.access_generation != generation:
+            self.access_cache.clear()
+            self.access_generation = generation
+        return self.access_cache
+
+    @staticmethod
+    def permissions_changed() -> None:
+        """Invalidate the access cache of every context in this process."""
+        ExecutionContext.permission_generation = next(ExecutionContext._generations)
+
     def get_root(self) -> Root:
         """Get current root."""
         return cast(Root, self.root_state.archetype)
 
 
+# Execution context of the current thread or asyncio task. Code that never set
+# one falls back to the process-wide default in `JacRuntime.exec_ctx`.
+_exec_ctx: ContextVar[ExecutionContext | None] = ContextVar(
+    "jac_exec_ctx", default=None
+)
+
+
 class JacAccessValidation:
     """Jac Access Validation Specs."""
 
@@ -265,6 +421,8 @@ class JacAccessValidation:
         _root_id = str(root_id)
         if level != access.anchors.get(_root_id, AccessLevel.NO_ACCESS):
             access.anchors[_root_id] = level
+            archetype.__jac__.mark_dirty()
+            ExecutionContext.permissions_changed()
 
     @staticmethod
     def disallow_root(
@@ -278,7 +436,9 @@ class JacAccessValidation:
         level = AccessLevel.cast(level)
         access = archetype.__jac__.access.roots
 
-        access.anchors.pop(str(root_id), None)
+        if access.anchors.pop(str(root_id), None) is not None:
+            archetype.__jac__.mark_dirty()
+            ExecutionContext.permissions_changed()
 
     @staticmethod
     def perm_grant(
@@ -291,6 +451,8 @@ class JacAccessValidation:
         level = AccessLevel.cast(level)
         if level != anchor.access.all:
             anchor.access.all = level
+            anchor.mark_dirty()
+            ExecutionContext.permissions_changed()
 
     @staticmethod
     def perm_revoke(archetype: Archetype) -> None:
@@ -298,6 +460,8 @@ class JacAccessValidation:
         anchor = archetype.__jac__
         if anchor.access.all > AccessLevel.NO_ACCESS:
             anchor.access.all = AccessLevel.NO_ACCESS
+            anchor.mark_dirty()
+            ExecutionContext.permissions_changed()
 
     @staticmethod
     def check_read_access(to: Anchor) -> bool:
@@ -340,8 +504,15 @@ class JacAccessValidation:
 
     @staticmethod
     def check_access_level(to: Anchor, no_custom: bool = False) -> AccessLevel:
-        """Access validation."""
-        if not to.persistent or to.hash == 0:
+        """Access validation.
+
+        Levels derived from the stored permissions are cached in the execution
+        context until `allow_root`, `disallow_root`, `perm_grant` or
+        `perm_revoke` changes a permission in any context of this process.
+        Changes made by other processes are only seen by contexts opened after
+        them. Custom `__jac_access__` levels are never cached.
+        """
+        if not to.persistent or not to.loaded:
             return AccessLevel.WRITE
 
         jctx = JacRuntimeInterface.get_context()
@@ -360,6 +531,10 @@ class JacAccessValidation:
         ):
             return AccessLevel.cast(custom_level)
 
+        cache = jctx.get_access_cache()
+        if (access_level := cache.get(key := (jroot.id, to.id))) is not None:
+            return access_level
+
         access_level = AccessLevel.NO_ACCESS
 
         # if target anchor have set access.all
@@ -380,9 +555,95 @@ class JacAccessValidation:
         if (level := to_access.roots.check(str(jroot.id))) is not None:
             access_level = level
 
+        cache[key] = access_level
         return access_level
 
 
+def _candidate_edges(
+    nanch: NodeAnchor, destination: ObjectSpatialDestination
+) -> Iterable[EdgeAnchor]:
+    """Get the edges of a node that may satisfy a typed destination.
+
+    When the destination carries an edge type, only the buckets of the node's
+    edge index that match it are read. Several matching buckets, such as the
+    outgoing and incoming ones of an any-direction hop, are merged by their
+    sequence numbers so results keep the order of the edge list. The
+    destination's filters still have to be applied to every candidate.
+    """
+    if (edge_type := destination.edge_type) is None:
+        return nanch.edges
+    directions = (
+        (EdgeDir.OUT, EdgeDir.IN)
+        if destination.direction == EdgeDir.ANY
+        else (destination.direction,)
+    )
+    buckets = [
+        bucket
+        for (direction, edge_cls), bucket in nanch.edge_index().items()
+        if bucket and direction in directions and issubclass(edge_cls, edge_type)
+    ]
+    if not buckets:
+        return ()
+    if len(buckets) == 1:
+        return buckets[0]
+    merged = heapq.merge(*(bucket.items() for bucket in buckets), key=itemgetter(1))
+    return (edge for edge, _ in merged)
+
+
+def _prefetch_anchors(anchors: Iterable[Anchor]) -> None:
+    """Populate the unloaded anchors among `anchors` with one bulk lookup."""
+    stubs = [anchor for anchor in anchors if not anchor.is_populated()]
+    if not stubs:
+        return
+    mem = JacRuntimeInterface.get_context().mem
+    found = {anchor.id: anchor for anchor in mem.find({stub.id for stub in stubs})}
+    for stub in stubs:
+        if (anchor := found.get(stub.id)) is not None:
+            stub.__dict__.update(anchor.__dict__)
+
+
+def _prefetch_edges(origin: list[NodeArchetype]) -> None:
+    """Load the edges of `origin` and their endpoints in bulk.
+
+    Edges of a node read back from storage are stubs that would otherwise be
+    populated one lookup at a time on first access, followed by one lookup
+    per endpoint. Edge lists already resolved are marked on the archetype's
+    own anchor, like the edge index, and skipped.
+    """
+    pending = [
+        node.__jac__
+        for node in origin
+        if node.__jac__.__dict__.get("_prefetched") is not node.__jac__.edges
+    ]
+    if not pending:
+        return
+    edges = [edge for nanch in pending for edge in nanch.edges]
+    _prefetch_anchors(edges)
+    _prefetch_anchors(
+        end
+        for edge in edges
+        if edge.is_populated()
+        for end in (edge.source, edge.target)
+    )
+    for nanch in pending:
+        nanch.__dict__["_prefetched"] = nanch.edges
+
+
+def _resolve_path(
+    path: ObjectSpatialPath | ObjectSpatialPlan | NodeArchetype | list[NodeArchetype],
+    origin: NodeArchetype | list[NodeArchetype] | None,
+) -> tuple[ObjectSpatialPath, list[NodeArchetype]]:
+    """Return the path to evaluate and the origin nodes it starts from."""
+    if isinstance(path, ObjectSpatialPlan):
+        path = path.path or path.resolve()
+    elif not isinstance(path, ObjectSpatialPath):
+        path = ObjectSpatialPath(path, [ObjectSpatialDestination(EdgeDir.OUT)])
+
+    if origin is None:
+        return path, path.origin
+    return path, origin if isinstance(origin, list) else [origin]
+
+
 class JacNode:
     """Jac Node Operations."""
 
@@ -391,29 +652,35 @@ class JacNode:
         origin: list[NodeArchetype], destination: ObjectSpatialDestination
     ) -> list[EdgeArchetype]:
         """Get edges connected to this node."""
-        edges: OrderedDict[EdgeAnchor, EdgeArchetype] = OrderedDict()
+        edges: dict[EdgeAnchor, EdgeArchetype] = {}
+        out = destination.direction != EdgeDir.IN
+        inc = destination.direction != EdgeDir.OUT
+        edge_filter = destination.edge_filter
+        node_filter = destination.node_filter
+        check_read_access = JacRuntimeInterface.check_read_access
+        _prefetch_edges(origin)
         for node in origin:
             nanch = node.__jac__
-            for anchor in nanch.edges:
+            for anchor in _candidate_edges(nanch, destination):
                 if (
                     (source := anchor.source)
                     and (target := anchor.target)
-                    and destination.edge_filter(anchor.archetype)
+                    and edge_filter(anchor.archetype)
                     and source.archetype
                     and target.archetype
                 ):
                     if (
-                        destination.direction in [EdgeDir.OUT, EdgeDir.ANY]
+                        out
                         and nanch == source
-                        and destination.node_filter(target.archetype)
-                        and JacRuntimeInterface.check_read_access(target)
+                        and node_filter(target.archetype)
+                        and check_read_access(target)
                     ):
                         edges[anchor] = anchor.archetype
                     if (
-                        destination.direction in [EdgeDir.IN, EdgeDir.ANY]
+                        inc
                         and nanch == target
-                        and destination.node_filter(source.archetype)
-                        and JacRuntimeInterface.check_read_access(source)
+                        and node_filter(source.archetype)
+                        and check_read_access(source)
                     ):
                         edges[anchor] = anchor.archetype
         return list(edges.values())
@@ -425,32 +692,36 @@ class JacNode:
         from_visit: bool = False,
     ) -> list[EdgeArchetype | NodeArchetype]:
         """Get edges connected to this node and the node."""
-        loc: OrderedDict[NodeAnchor | EdgeAnchor, NodeArchetype | EdgeArchetype] = (
-            OrderedDict()
-        )
+        loc: dict[NodeAnchor | EdgeAnchor, NodeArchetype | EdgeArchetype] = {}
+        out = destination.direction != EdgeDir.IN
+        inc = destination.direction != EdgeDir.OUT
+        edge_filter = destination.edge_filter
+        node_filter = destination.node_filter
+        check_read_access = JacRuntimeInterface.check_read_access
+        _prefetch_edges(origin)
         for node in origin:
             nanch = node.__jac__
-            for anchor in nanch.edges:
+            for anchor in _candidate_edges(nanch, destination):
                 if (
                     (source := anchor.source)
                     and (target := anchor.target)
-                    and destination.edge_filter(anchor.archetype)
+                    and edge_filter(anchor.archetype)
                     and source.archetype
                     and target.archetype
                 ):
                     if (
-                        destination.direction in [EdgeDir.OUT, EdgeDir.ANY]
+                        out
                         and nanch == source
-                        and destination.node_filter(target.archetype)
-                        and JacRuntimeInterface.check_read_access(target)
+                        and node_filter(target.archetype)
+                        and check_read_access(target)
                     ):
                         loc[anchor] = anchor.archetype
                         loc[target] = target.archetype
                     if (
-                        destination.direction in [EdgeDir.IN, EdgeDir.ANY]
+                        inc
                         and nanch == target
-                        and destination.node_filter(source.archetype)
-                        and JacRuntimeInterface.check_read_access(source)
+                        and node_filter(source.archetype)
+                        and check_read_access(source)
                     ):
                         loc[anchor] = anchor.archetype
                         loc[source] = source.archetype
@@ -461,29 +732,35 @@ class JacNode:
         origin: list[NodeArchetype], destination: ObjectSpatialDestination
     ) -> list[NodeArchetype]:
         """Get set of nodes connected to this node."""
-        nodes: OrderedDict[NodeAnchor, NodeArchetype] = OrderedDict()
+        nodes: dict[NodeAnchor, NodeArchetype] = {}
+        out = destination.direction != EdgeDir.IN
+        inc = destination.direction != EdgeDir.OUT
+        edge_filter = destination.edge_filter
+        node_filter = destination.node_filter
+        check_read_access = JacRuntimeInterface.check_read_access
+        _prefetch_edges(origin)
         for node in origin:
             nanch = node.__jac__
-            for anchor in nanch.edges:
+            for anchor in _candidate_edges(nanch, destination):
                 if (
                     (source := anchor.source)
                     and (target := anchor.target)
-                    and destination.edge_filter(anchor.archetype)
+                    and edge_filter(anchor.archetype)
                     and source.archetype
                     and target.archetype
                 ):
                     if (
-                        destination.direction in [EdgeDir.OUT, EdgeDir.ANY]
+                        out
                         and nanch == source
-                        and destination.node_filter(target.archetype)
-                        and JacRuntimeInterface.check_read_access(target)
+                        and node_filter(target.archetype)
+                        and check_read_access(target)
                     ):
                         nodes[target] = target.archetype
                     if (
-                        destination.direction in [EdgeDir.IN, EdgeDir.ANY]
+                        inc
                         and nanch == target
-                        and destination.node_filter(source.archetype)
-                        and JacRuntimeInterface.check_read_access(source)
+                        and node_filter(source.archetype)
+                        and check_read_access(source)
                     ):
                         nodes[source] = source.archetype
         return list(nodes.values())
@@ -494,6 +771,8 @@ class JacNode:
         for idx, ed in enumerate(node.edges):
             if ed.id == edge.id:
                 node.edges.pop(idx)
+                node.unindex_edge(edge)
+                node.mark_dirty()
                 break
 
 
@@ -507,6 +786,79 @@ class JacEdge:
         JacRuntimeInterface.remove_edge(node=edge.target, edge=edge)
 
 
+AbilityDispatch: TypeAlias = list[tuple[Callable[[Any, Any], Any], bool]]
+_ability_dispatch_cache: dict[tuple[type, type | bool], AbilityDispatch] = {}
+
+
+def _ability_dispatch(
+    walker_cls: type[WalkerArchetype],
+    loc_cls: type[Archetype] | None,
+    entry: bool = True,
+) -> AbilityDispatch:
+    """Get the abilities a walker class triggers, in call order.
+
+    With a location class, these are the abilities run for every visited
+    location of that class: walker abilities with a matching location entry,
+    location abilities with any and walker entries, location abilities with
+    walker and any exits, and walker abilities with a matching location exit.
+    Without one, these are the walker's own any entry (or exit) abilities.
+    Each item is the function and whether the walker is its first argument.
+
+    Tables are resolved on first use and dropped by `make_archetype`,
+    `update_walker` and `reset_machine`.
+    """
+    key = (walker_cls, loc_cls if loc_cls is not None else entry)
+    if (dispatch := _ability_dispatch_cache.get(key)) is not None:
+        return dispatch
+
+    from jaclang.runtimelib.utils import all_issubclass
+
+    if loc_cls is None:
+        funcs = walker_cls._jac_entry_funcs_ if entry else walker_cls._jac_exit_funcs_
+        dispatch = [(i.func, True) for i in funcs if not i.trigger]
+    else:
+
+        def is_loc_trigger(i: ObjectSpatialFunction) -> bool:
+            return bool(
+                i.trigger
+                and (
+                    all_issubclass(i.trigger, NodeArchetype)
+                    or all_issubclass(i.trigger, EdgeArchetype)
+                )
+                and issubclass(loc_cls, i.trigger)
+            )
+
+        def is_walker_trigger(i: ObjectSpatialFunction) -> bool:
+            return bool(
+                i.trigger
+                and all_issubclass(i.trigger, WalkerArchetype)
+                and issubclass(walker_cls, i.trigger)
+            )
+
+        dispatch = [
+            *(
+                (i.func, True)
+                for i in walker_cls._jac_entry_funcs_
+                if is_loc_trigger(i)
+            ),
+            *((i.func, False) for i in loc_cls._jac_entry_funcs_ if not i.trigger),
+            *(
+                (i.func, False)
+                for i in loc_cls._jac_entry_funcs_
+                if is_walker_trigger(i)
+            ),
+            *(
+                (i.func, False)
+                for i in loc_cls._jac_exit_funcs_
+                if is_walker_trigger(i)
+            ),
+            *((i.func, False) for i in loc_cls._jac_exit_funcs_ if not i.trigger),
+            *((i.func, True) for i in walker_cls._jac_exit_funcs_ if is_loc_trigger(i)),
+        ]
+    _ability_dispatch_cache[key] = dispatch
+    return dispatch
+
+
 class JacWalker:
     """Jac Edge Operations."""
 
@@ -526,22 +878,37 @@ class JacWalker:
         if isinstance(walker, WalkerArchetype):
             """Walker visits node."""
             wanch = walker.__jac__
-            before_len = len(wanch.next)
+            frontier = wanch.next
             next = []
             for anchor in (
                 (i.__jac__ for i in expr) if isinstance(expr, list) else [expr.__jac__]
             ):
-                if anchor not in wanch.ignores:
+                if anchor.id not in wanch.ignores:
                     if isinstance(anchor, (NodeAnchor, EdgeAnchor)):
                         next.append(anchor)
                     else:
                         raise ValueError("Anchor should be NodeAnchor or EdgeAnchor.")
-            if insert_loc < -len(wanch.next):  # for out of index selection
+            if not next:
+                return False
+            if insert_loc < -len(frontier):  # for out of index selection
                 insert_loc = 0
             elif insert_loc < 0:
-                insert_loc += len(wanch.next) + 1
-            wanch.next = wanch.next[:insert_loc] + next + wanch.next[insert_loc:]
-            return len(wanch.next) > before_len
+                insert_loc += len(frontier) + 1
+            # splice into the deque in place, rotating the shorter side around
+            if insert_loc >= len(frontier):
+                frontier.extend(next)
+            elif insert_loc == 0:
+                frontier.extendleft(reversed(next))
+            elif insert_loc <= len(frontier) // 2:
+                frontier.rotate(-insert_loc)
+                frontier.extendleft(reversed(next))
+                frontier.rotate(insert_loc)
+            else:
+                tail = len(frontier) - insert_loc
+                frontier.rotate(tail)
+                frontier.extend(next)
+                frontier.rotate(-tail)
+            return True
         else:
             raise TypeError("Invalid walker object")
 
@@ -551,92 +918,36 @@ class JacWalker:
         node: NodeAnchor | EdgeAnchor,
     ) -> WalkerArchetype:
         """Jac's spawn operator feature."""
-        from jaclang.runtimelib.utils import all_issubclass
-
         warch = walker.archetype
+        walker_cls = type(warch)
         walker.path = []
         current_loc = node.archetype
 
         # walker ability on any entry
-        for i in warch._jac_entry_funcs_:
-            if not i.trigger:
-                i.func(warch, current_loc)
+        for func, on_walker in _ability_dispatch(walker_cls, None, entry=True):
+            func(warch, current_loc) if on_walker else func(current_loc, warch)
             if walker.disengaged:
                 return warch
 
         while len(walker.next):
-            if current_loc := walker.next.pop(0).archetype:
-                # walker ability with loc entry
-                for i in warch._jac_entry_funcs_:
-                    if (
-                        i.trigger
-                        and (
-                            all_issubclass(i.trigger, NodeArchetype)
-                            or all_issubclass(i.trigger, EdgeArchetype)
-                        )
-                        and isinstance(current_loc, i.trigger)
-                    ):
-                        i.func(warch, current_loc)
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with any entry
-                for i in current_loc._jac_entry_funcs_:
-                    if not i.trigger:
-                        i.func(current_loc, warch)
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with walker entry
-                for i in current_loc._jac_entry_funcs_:
-                    if (
-                        i.trigger
-                        and all_issubclass(i.trigger, WalkerArchetype)
-                        and isinstance(warch, i.trigger)
-                    ):
-                        i.func(current_loc, warch)
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with walker exit
-                for i in current_loc._jac_exit_funcs_:
-                    if (
-                        i.trigger
-                        and all_issubclass(i.trigger, WalkerArchetype)
-                        and isinstance(warch, i.trigger)
-                    ):
-                        i.func(current_loc, warch)
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with any exit
-                for i in current_loc._jac_exit_funcs_:
-                    if not i.trigger:
-                        i.func(current_loc, warch)
-                    if walker.disengaged:
-                        return warch
-
-                # walker ability with loc exit
-                for i in warch._jac_exit_funcs_:
-                    if (
-                        i.trigger
-                        and (
-                            all_issubclass(i.trigger, NodeArchetype)
-                            or all_issubclass(i.trigger, EdgeArchetype)
-                        )
-                        and isinstance(current_loc, i.trigger)
-                    ):
-                        i.func(warch, current_loc)
+            if current_loc := walker.next.popleft().archetype:
+                # walker ability with loc entry, loc ability with any and walker
+                # entry and exit, walker ability with loc exit
+                for func, on_walker in _ability_dispatch(walker_cls, type(current_loc)):
+                    (
+                        func(warch, current_loc)
+                        if on_walker
+                        else func(current_loc, warch)
+                    )
                     if walker.disengaged:
                         return warch
         # walker ability with any exit
-        for i in warch._jac_exit_funcs_:
-            if not i.trigger:
-                i.func(warch, current_loc)
+        for func, on_walker in _ability_dispatch(walker_cls, None, entry=False):
+            func(warch, current_loc) if on_walker else func(current_loc, warch)
             if walker.disengaged:
                 return warch
 
-        walker.ignores = []
+        walker.ignores.clear()
         return warch
 
     @staticmethod
@@ -645,108 +956,42 @@ class JacWalker:
         node: NodeAnchor | EdgeAnchor,
     ) -> WalkerArchetype:
         """Jac's spawn operator feature."""
-        from jaclang.runtimelib.utils import all_issubclass
-
         warch = walker.archetype
+        walker_cls = type(warch)
         walker.path = []
         current_loc = node.archetype
 
         # walker ability on any entry
-        for i in warch._jac_entry_funcs_:
-            if not i.trigger:
-                result = i.func(warch, current_loc)
-                if isinstance(result, Coroutine):
-                    await result
+        for func, on_walker in _ability_dispatch(walker_cls, None, entry=True):
+            result = func(warch, current_loc) if on_walker else func(current_loc, warch)
+            if isinstance(result, Coroutine):
+                await result
             if walker.disengaged:
                 return warch
 
         while len(walker.next):
-            if current_loc := walker.next.pop(0).archetype:
-                # walker ability with loc entry
-                for i in warch._jac_entry_funcs_:
-                    if (
-                        i.trigger
-                        and (
-                            all_issubclass(i.trigger, NodeArchetype)
-                            or all_issubclass(i.trigger, EdgeArchetype)
-                        )
-                        and isinstance(current_loc, i.trigger)
-                    ):
-                        result = i.func(warch, current_loc)
-                        if isinstance(result, Coroutine):
-                            await result
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with any entry
-                for i in current_loc._jac_entry_funcs_:
-                    if not i.trigger:
-                        result = i.func(current_loc, warch)
-                        if isinstance(result, Coroutine):
-                            await result
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with walker entry
-                for i in current_loc._jac_entry_funcs_:
-                    if (
-                        i.trigger
-                        and all_issubclass(i.trigger, WalkerArchetype)
-                        and isinstance(warch, i.trigger)
-                    ):
-                        result = i.func(current_loc, warch)
-                        if isinstance(result, Coroutine):
-                            await result
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with walker exit
-                for i in current_loc._jac_exit_funcs_:
-                    if (
-                        i.trigger
-                        and all_issubclass(i.trigger, WalkerArchetype)
-                        and isinstance(warch, i.trigger)
-                    ):
-                        result = i.func(current_loc, warch)
-                        if isinstance(result, Coroutine):
-                            await result
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with any exit
-                for i in current_loc._jac_exit_funcs_:
-                    if not i.trigger:
-                        result = i.func(current_loc, warch)
-                        if isinstance(result, Coroutine):
-                            await result
-                    if walker.disengaged:
-                        return warch
-
-                # walker ability with loc exit
-                for i in warch._jac_exit_funcs_:
-                    if (
-                        i.trigger
-                        and (
-                            all_issubclass(i.trigger, NodeArchetype)
-                            or all_issubclass(i.trigger, EdgeArchetype)
-                        )
-                        and isinstance(current_loc, i.trigger)
-                    ):
-                        result = i.func(warch, current_loc)
-                        if isinstance(result, Coroutine):
-                            await result
+            if current_loc := walker.next.popleft().archetype:
+                # walker ability with loc entry, loc ability with any and walker
+                # entry and exit, walker ability with loc exit
+                for func, on_walker in _ability_dispatch(walker_cls, type(current_loc)):
+                    result = (
+                        func(warch, current_loc)
+                        if on_walker
+                        else func(current_loc, warch)
+                    )
+                    if isinstance(result, Coroutine):
+                        await result
                     if walker.disengaged:
                         return warch
         # walker ability with any exit
-        for i in warch._jac_exit_funcs_:
-            if not i.trigger:
-                result = i.func(warch, current_loc)
-                if isinstance(result, Coroutine):
-                    await result
+        for func, on_walker in _ability_dispatch(walker_cls, None, entry=False):
+            result = func(warch, current_loc) if on_walker else func(current_loc, warch)
+            if isinstance(result, Coroutine):
+                await result
             if walker.disengaged:
                 return warch
 
-        walker.ignores = []
+        walker.ignores.clear()
         return warch
 
     @staticmethod
@@ -774,11 +1019,11 @@ class JacWalker:
         ) -> NodeAnchor | EdgeAnchor:
             if isinstance(t, NodeArchetype):
                 node = t.__jac__
-                walker.next = [node]
+                walker.next = deque([node])
                 return node
             elif isinstance(t, EdgeArchetype):
                 edge = t.__jac__
-                walker.next = [edge, edge.target]
+                walker.next = deque([edge, edge.target])
                 return edge
             elif isinstance(t, list) and all(
                 isinstance(i, (NodeArchetype, EdgeArchetype)) for i in t
@@ -824,6 +1069,11 @@ class _JacClassReferencesMeta(type):
 
             cls.OPath = ObjectSpatialPath
             return ObjectSpatialPath
+        elif name == "OPlan":
+            from jaclang.runtimelib.archetype import ObjectSpatialPlan
+
+            cls.OPlan = ObjectSpatialPlan
+            return ObjectSpatialPlan
         elif name == "Root":
             from jaclang.runtimelib.archetype import Root as _Root
 
@@ -869,6 +1119,9 @@ class JacClassReferences(metaclass=_JacClassReferencesMeta):
         from jaclang.runtimelib.archetype import (
             ObjectSpatialPath as OPath,
         )
+        from jaclang.runtimelib.archetype import (
+            ObjectSpatialPlan as OPlan,
+        )
         from jaclang.runtimelib.archetype import (
             Root,
         )
@@ -903,87 +1156,108 @@ class JacBuiltin:
         node_limit: int,
         file: str | None,
         format: str,
+        sample: float = 1.0,
+        sink: TextIO | None = None,
     ) -> str:
-        """Generate graph for visualizing nodes and edges."""
+        """Generate graph for visualizing nodes and edges.
+
+        Edges are written out as they are found, and nodes once their depth
+        is known. With a `sink`, or a `file` to open as one, the graph is
+        streamed there and an empty string is returned, so large graphs are
+        never held in memory. `sample` keeps that fraction of the nodes,
+        chosen by id.
+        """
         from jaclang.runtimelib.utils import traverse_graph
 
-        edge_type = edge_type if edge_type else []
-        visited_nodes: list[NodeArchetype] = []
-        node_depths: dict[NodeArchetype, int] = {node: 0}
-        queue: list = [[node, 0]]
-        connections: list[tuple[NodeArchetype, NodeArchetype, EdgeArchetype]] = []
-
-        def dfs(node: NodeArchetype, cur_depth: int) -> None:
-            """Depth first search."""
-            if node not in visited_nodes:
-                visited_nodes.append(node)
-                traverse_graph(
+        if file and sink is None:
+            with open(file, "w") as f:
+                return JacBuiltin.printgraph(
                     node,
-                    cur_depth,
                     depth,
-                    edge_type,
                     traverse,
-                    connections,
-                    node_depths,
-                    visited_nodes,
-                    queue,
+                    edge_type,
                     bfs,
-                    dfs,
-                    node_limit,
                     edge_limit,
+                    node_limit,
+                    None,
+                    format,
+                    sample,
+                    f,
                 )
+        out = sink or io.StringIO()
+        mermaid = format != "dot"
+        edge_type = edge_type if edge_type else []
+        visited_nodes: set[NodeArchetype] = {node}
+        # ids of the nodes, numbered in the order they are visited
+        node_ids: dict[NodeArchetype, int] = {node: 0}
+        node_depths: dict[NodeArchetype, int] = {node: 0}
+        connections: set[tuple[NodeArchetype, NodeArchetype, EdgeArchetype]] = set()
+
+        def follow(current: NodeArchetype, cur_depth: int) -> Iterator[NodeArchetype]:
+            """Write the connections of a node and yield the connected nodes."""
+            for (source, target, edge), other in traverse_graph(
+                current,
+                cur_depth,
+                depth,
+                edge_type,
+                traverse,
+                connections,
+                node_depths,
+                visited_nodes,
+                node_limit,
+                edge_limit,
+                sample,
+            ):
+                src = node_ids.setdefault(source, len(node_ids))
+                dst = node_ids.setdefault(target, len(node_ids))
+                edge_label = html.escape(str(edge.__jac__.archetype))
+                if not mermaid:
+                    out.write(
+                        f"{src} -> {dst} "
+                        f' [label="{edge_label if "GenericEdge" not in edge_label else ""}"];\n'
+                    )
+                elif "GenericEdge" in edge_label or not edge_label.strip():
+                    out.write(f"{src} -->{dst}\n")
+                else:
+                    out.write(f'{src} -->|"{edge_label}"| {dst}\n')
+                yield other
 
+        out.write(
+            "flowchart LR\n"
+            if mermaid
+            else 'digraph {\nnode [style="filled", shape="ellipse", fillcolor="invis", fontcolor="black"];\n'
+        )
         if bfs:
-            cur_depth = 0
+            queue: deque[tuple[NodeArchetype, int]] = deque([(node, 0)])
             while queue:
-                current_node, cur_depth = queue.pop(0)
-                if current_node not in visited_nodes:
-                    visited_nodes.append(current_node)
-                    traverse_graph(
-                        current_node,
-                        cur_depth,
-                        depth,
-                        edge_type,
-                        traverse,
-                        connections,
-                        node_depths,
-                        visited_nodes,
-                        queue,
-                        bfs,
-                        dfs,
-                        node_limit,
-                        edge_limit,
+                current, cur_depth = queue.popleft()
+                if current is node or current not in visited_nodes:
+                    visited_nodes.add(current)
+                    queue.extend(
+                        (other, cur_depth + 1) for other in follow(current, cur_depth)
                     )
         else:
-            dfs(node, cur_depth=0)
-        dot_content = 'digraph {\nnode [style="filled", shape="ellipse", fillcolor="invis", fontcolor="black"];\n'
-        mermaid_content = "flowchart LR\n"
-        for source, target, edge in connections:
-            edge_label = html.escape(str(edge.__jac__.archetype))
-            dot_content += (
-                f"{visited_nodes.index(source)} -> {visited_nodes.index(target)} "
-                f' [label="{edge_label if "GenericEdge" not in edge_label else ""}"];\n'
-            )
-            if "GenericEdge" in edge_label or not edge_label.strip():
-                mermaid_content += (
-                    f"{visited_nodes.index(source)} -->{visited_nodes.index(target)}\n"
-                )
-            else:
-                mermaid_content += f'{visited_nodes.index(source)} -->|"{edge_label}"| {visited_nodes.index(target)}\n'
-        for node_ in visited_nodes:
+            stack = [follow(node, 0)]
+            while stack:
+                if (other := next(stack[-1], None)) is None:
+                    stack.pop()
+                elif other not in visited_nodes:
+                    visited_nodes.add(other)
+                    stack.append(follow(other, len(stack)))
+        for node_, node_id in node_ids.items():
             color = (
                 colors[node_depths[node_]] if node_depths[node_] < 25 else colors[24]
             )
             label = html.escape(str(node_.__jac__.archetype))
-            dot_content += (
-                f'{visited_nodes.index(node_)} [label="{label}"fillcolor="{color}"];\n'
-            )
-            mermaid_content += f'{visited_nodes.index(node_)}["{label}"]\n'
-        output = dot_content + "}" if format == "dot" else mermaid_content
-        if file:
-            with open(file, "w") as f:
-                f.write(output)
-        return output
+            if mermaid:
+                out.write(f'{node_id}["{label}"]\n')
+            else:
+                out.write(f'{node_id} [label="{label}"fillcolor="{color}"];\n')
+        if not mermaid:
+            out.write("}")
+        if sink is not None:
+            return ""
+        return cast(io.StringIO, out).getvalue()
 
 
 class JacCmd:
@@ -1004,6 +1278,8 @@ class JacBasics:
     @staticmethod
     def get_context() -> ExecutionContext:
         """Get current execution context."""
+        if (ctx := _exec_ctx.get()) is not None:
+            return ctx
         if JacRuntime.exec_ctx is None:
             JacRuntime.exec_ctx = JacRuntimeInterface.create_j_context()
         return JacRuntime.exec_ctx
@@ -1021,16 +1297,12 @@ class JacBasics:
     def reset_graph(root: Root | None = None) -> int:
         """Purge current or target graph."""
         ctx = JacRuntimeInterface.get_context()
-        mem = cast(ShelfStorage, ctx.mem)
+        mem = ctx.mem
         ranchor = root.__jac__ if root else ctx.root_state
 
         deleted_count = 0
-        for anchor in (
-            anchors.values()
-            if isinstance(anchors := mem.__shelf__, Shelf)
-            else mem.__mem__.values()
-        ):
-            if anchor == ranchor or anchor.root != ranchor.id:
+        for anchor in list(mem.find_by_root(ranchor.id)):
+            if anchor == ranchor:
                 continue
 
             if loaded_anchor := mem.find_by_id(anchor.id):
@@ -1076,6 +1348,7 @@ class JacBasics:
 
         cls._jac_entry_funcs_ = [*entries.values()]
         cls._jac_exit_funcs_ = [*exits.values()]
+        _ability_dispatch_cache.clear()
 
         dataclass(eq=False)(cls)
         return cls
@@ -1408,35 +1681,59 @@ class JacBasics:
 
     @staticmethod
     def refs(
-        path: ObjectSpatialPath | NodeArchetype | list[NodeArchetype],
+        path: ObjectSpatialPath
+        | ObjectSpatialPlan
+        | NodeArchetype
+        | list[NodeArchetype],
+        origin: NodeArchetype | list[NodeArchetype] | None = None,
     ) -> (
         list[NodeArchetype] | list[EdgeArchetype] | list[NodeArchetype | EdgeArchetype]
     ):
-        """Jac's apply_dir stmt feature."""
-        if not isinstance(path, ObjectSpatialPath):
-            path = ObjectSpatialPath(path, [ObjectSpatialDestination(EdgeDir.OUT)])
-
-        origin = path.origin
+        """Jac's apply_dir stmt feature.
 
-        destinations = path.destinations[:-1] if path.edge_only else path.destinations
-        while destinations:
-            dest = path.destinations.pop(0)
-            origin = JacRuntimeInterface.edges_to_nodes(origin, dest)
+        A compiled plan is passed along with the origin of this evaluation,
+        which replaces the origin of its path.
+        """
+        path, origin = _resolve_path(path, origin)
+        destinations = path.destinations
+        hops = len(destinations) - 1 if path.edge_only else len(destinations)
+        for idx in range(hops):
+            origin = JacRuntimeInterface.edges_to_nodes(origin, destinations[idx])
 
         if path.edge_only:
             if path.from_visit:
-                return JacRuntimeInterface.get_edges_with_node(
-                    origin, path.destinations[-1]
-                )
-            return JacRuntimeInterface.get_edges(origin, path.destinations[-1])
+                return JacRuntimeInterface.get_edges_with_node(origin, destinations[-1])
+            return JacRuntimeInterface.get_edges(origin, destinations[-1])
         return origin
 
     @staticmethod
     async def arefs(
-        path: ObjectSpatialPath | NodeArchetype | list[NodeArchetype],
-    ) -> None:
-        """Jac's apply_dir stmt feature."""
-        pass
+        path: ObjectSpatialPath
+        | ObjectSpatialPlan
+        | NodeArchetype
+        | list[NodeArchetype],
+        origin: NodeArchetype | list[NodeArchetype] | None = None,
+    ) -> (
+        list[NodeArchetype] | list[EdgeArchetype] | list[NodeArchetype | EdgeArchetype]
+    ):
+        """Jac's apply_dir stmt feature, awaiting storage reads.
+
+        The edges and endpoints of each frontier are loaded with one bulk
+        lookup in a worker thread, then the hop itself runs in memory.
+        """
+        path, origin = _resolve_path(path, origin)
+        destinations = path.destinations
+        hops = len(destinations) - 1 if path.edge_only else len(destinations)
+        for idx in range(hops):
+            await asyncio.to_thread(_prefetch_edges, origin)
+            origin = JacRuntimeInterface.edges_to_nodes(origin, destinations[idx])
+
+        await asyncio.to_thread(_prefetch_edges, origin)
+        if path.edge_only:
+            if path.from_visit:
+                return JacRuntimeInterface.get_edges_with_node(origin, destinations[-1])
+            return JacRuntimeInterface.get_edges(origin, destinations[-1])
+        return origin
 
     @staticmethod
     def filter_on(
@@ -1487,9 +1784,11 @@ class JacBasics:
         left = [left] if isinstance(left, NodeArchetype) else left
         right = [right] if isinstance(right, NodeArchetype) else right
 
+        right_anchors = {j.__jac__ for j in right}
+
         for i in left:
             node = i.__jac__
-            for anchor in set(node.edges):
+            for anchor in dict.fromkeys(node.edges):
                 if (
                     (source := anchor.source)
                     and (target := anchor.target)
@@ -1500,7 +1799,7 @@ class JacBasics:
                     if (
                         dir in [EdgeDir.OUT, EdgeDir.ANY]
                         and node == source
-                        and target.archetype in right
+                        and target in right_anchors
                         and JacRuntimeInterface.check_connect_access(target)
                     ):
                         (
@@ -1512,7 +1811,7 @@ class JacBasics:
                     if (
                         dir in [EdgeDir.IN, EdgeDir.ANY]
                         and node == target
-                        and source.archetype in right
+                        and source in right_anchors
                         and JacRuntimeInterface.check_connect_access(source)
                     ):
                         (
@@ -1564,6 +1863,11 @@ class JacBasics:
             )
             source.edges.append(eanch)
             target.edges.append(eanch)
+            source.mark_dirty()
+            target.mark_dirty()
+            source.index_edge(eanch)
+            if target is not source:
+                target.index_edge(eanch)
 
             if conn_assign:
                 for fld, val in zip(conn_assign[0], conn_assign[1], strict=False):
@@ -1589,6 +1893,7 @@ class JacBasics:
         if not anchor.persistent and not anchor.root:
             anchor.persistent = True
             anchor.root = jctx.root_state.id
+            anchor.mark_dirty()
 
         jctx.mem.set(anchor)
 
@@ -1803,10 +2108,12 @@ class JacUtils:
 
     @staticmethod
     def create_j_context(
-        session: str | None = None, root: str | None = None
+        session: str | None = None,
+        root: str | None = None,
+        pool: StoragePool | None = None,
     ) -> ExecutionContext:
         """Hook for initialization or custom greeting logic."""
-        return ExecutionContext(session=session, root=root)
+        return ExecutionContext(session=session, root=root, pool=pool)
 
     @staticmethod
     def attach_program(jac_program: JacProgram) -> None:
@@ -1942,6 +2249,7 @@ class JacUtils:
                 old_module = JacRuntime.loaded_modules[module_name]
 
                 # Use jac_import with reload flag
+                _ability_dispatch_cache.clear()
                 result = JacRuntimeInterface.jac_import(
                     target=module_name,
                     base_path=JacRuntime.base_path_dir,
@@ -2008,10 +2316,23 @@ class JacUtils:
         return None
 
     @staticmethod
-    def thread_run(func: Callable, *args: object) -> Future:  # noqa: ANN401
-        """Run a function in a thread."""
-        _executor = JacRuntime.pool
-        return _executor.submit(func, *args)
+    def thread_run(
+        func: Callable, *args: object, executor: str | None = None
+    ) -> Future:
+        """Run a function concurrently and return a future for its result.
+
+        `executor` picks the backend for this call and defaults to the
+        `flow_executor` setting. `thread` runs the function on the shared
+        thread pool, inheriting the caller's context. `process` and
+        `interpreter` run it in worker processes or subinterpreters, which
+        suits CPU-bound work (see `jaclang.runtimelib.executor`).
+        """
+        kind = executor or settings.flow_executor
+        if kind == "thread":
+            return JacRuntime.pool.submit(copy_context().run, func, *args)
+        from jaclang.runtimelib.executor import submit
+
+        return submit(kind, func, args)
 
     @staticmethod
     def thread_wait(future: Any) -> None:  # noqa: ANN401
@@ -2112,8 +2433,12 @@ def generate_plugin_helpers(
 
         def make_proxy(name: str, sig: inspect.Signature) -> Callable:
             """Create a proxy method for the proxy class."""
+            direct_call = plugin_manager.direct_call
 
             def proxy(*args: object, **kwargs: object) -> object:
+                # single plain implementation: skip binding and pluggy dispatch
+                if (func := direct_call(name)) is not None:
+                    return func(*args, **kwargs)
                 # bind positionals to parameter names
                 bound = sig.bind_partial(*args, **kwargs)  # noqa
                 bound.apply_defaults()
@@ -2127,6 +2452,7 @@ def generate_plugin_helpers(
             return proxy
 
         proxy_methods[name] = make_proxy(name, sig)
+        plugin_manager.register_interface(name, method)
 
     # Construct classes
     spec_cls = type(f"{plugin_class.__name__}Spec", (object,), spec_methods)
@@ -2171,8 +2497,14 @@ class JacRuntime(JacRuntimeInterface):
 
     @staticmethod
     def set_context(context: ExecutionContext) -> None:
-        """Set the context for the machine."""
-        JacRuntime.exec_ctx = context
+        """Set the context for the current thread or asyncio task.
+
+        Contexts set on the main thread also become the default for threads
+        that never set their own.
+        """
+        _exec_ctx.set(context)
+        if threading.current_thread() is threading.main_thread():
+            JacRuntime.exec_ctx = context
 
     @staticmethod
     def reset_machine() -> None:
@@ -2198,11 +2530,17 @@ class JacRuntime(JacRuntimeInterface):
             if i.__name__ not in special_modules:
                 sys.modules.pop(i.__name__, None)
         JacRuntime.loaded_modules.clear()
+        _ability_dispatch_cache.clear()
         JacRuntime.base_path_dir = os.getcwd()
         JacRuntime.program = JacProgram()
         from concurrent.futures import ThreadPoolExecutor
 
         JacRuntime.pool = ThreadPoolExecutor()
-        if JacRuntime.exec_ctx is not None:
+        if (executor := sys.modules.get("jaclang.runtimelib.executor")) is not None:
+            executor.shutdown()
+        if (ctx := _exec_ctx.get()) is not None:
+            ctx.mem.close()
+        if JacRuntime.exec_ctx is not None and JacRuntime.exec_ctx is not ctx:
             JacRuntime.exec_ctx.mem.close()
         JacRuntime.exec_ctx = JacRuntimeInterface.create_j_context()
+        _exec_ctx.set(JacRuntime.exec_ctx)
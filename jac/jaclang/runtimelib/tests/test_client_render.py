@@ -10,7 +10,6 @@ import pytest
 
 from jaclang.runtimelib.runtime import JacRuntime as Jac
 from jaclang.runtimelib.server import JacAPIServer
-from jaclang.runtimelib.tests.conftest import fixture_abs_path
 
 
 @pytest.fixture(autouse=True)
@@ -21,21 +20,21 @@ def reset_machine():
     Jac.reset_machine()
 
 
-def make_server() -> JacAPIServer:
-    """Create a test server instance."""
+def make_server(session_dir: Path) -> JacAPIServer:
+    """Create a test server instance with its session under session_dir."""
     fixtures_dir = Path(__file__).parent / "fixtures"
     Jac.jac_import("client_app", str(fixtures_dir))
     server = JacAPIServer(
         module_name="client_app",
-        session_path=str(fixture_abs_path("client.session")),
+        session_path=str(session_dir / "client.session"),
     )
     server.load_module()
     return server
 
 
-def test_render_client_page_returns_html():
+def test_render_client_page_returns_html(tmp_path: Path):
     """Test that render_client_page returns HTML."""
-    server = make_server()
+    server = make_server(tmp_path)
     server.user_manager.create_user("tester", "pass")
     html_bundle = server.render_client_page("client_page", {}, "tester")
 
@@ -59,9 +58,9 @@ def test_render_client_page_returns_html():
     assert bundle_code == html_bundle["bundle_code"]
 
 
-def test_render_unknown_page_raises():
+def test_render_unknown_page_raises(tmp_path: Path):
     """Test that rendering unknown page raises ValueError."""
-    server = make_server()
+    server = make_server(tmp_path)
     server.user_manager.create_user("tester", "pass")
 
     with pytest.raises(ValueError):
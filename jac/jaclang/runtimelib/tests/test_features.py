@@ -1,9 +1,11 @@
 """Tests for Jac parser."""
 
 import inspect
+import threading
 
 import pluggy
 
+from jaclang.runtimelib.archetype import NodeArchetype
 from jaclang.runtimelib.runtime import (
     JacRuntimeImpl,
     JacRuntimeInterface,
@@ -63,3 +65,224 @@ def test_multiple_plugins():
     # Execute the hook and check both results are returned
     results = pm.hook.setup()
     assert "I'm here" in results
+
+
+def test_direct_dispatch_rebinds_on_register():
+    """Test that single-implementation hooks are rebound as plugins change."""
+    from jaclang.runtimelib.runtime import hookimpl, plugin_manager
+
+    assert plugin_manager.direct_call("setup") is JacRuntimeImpl.setup
+
+    class SetupPlugin:
+        @staticmethod
+        @hookimpl
+        def setup() -> str:
+            return "plugged"
+
+    plugin = SetupPlugin()
+    plugin_manager.register(plugin)
+    try:
+        assert plugin_manager.direct_call("setup") is None
+        assert JacRuntimeInterface.setup() == "plugged"
+    finally:
+        plugin_manager.unregister(plugin)
+
+    assert plugin_manager.direct_call("setup") is JacRuntimeImpl.setup
+    assert JacRuntimeInterface.setup() is None
+
+    plugin_manager.set_direct_dispatch(False)
+    try:
+        assert plugin_manager.direct_call("setup") is None
+        assert JacRuntimeInterface.setup() is None
+    finally:
+        plugin_manager.set_direct_dispatch(True)
+
+
+def test_ability_dispatch_tables():
+    """Test that walker ability tables keep call order and are invalidated."""
+    from jaclang.lib import Node, Walker, on_entry, on_exit, spawn
+    from jaclang.runtimelib.runtime import _ability_dispatch_cache
+
+    calls: list[str] = []
+
+    class Stop(Node):
+        @on_entry
+        def any_entry(self, visitor) -> None:  # noqa: ANN001
+            calls.append("loc any entry")
+
+        @on_exit
+        def walker_exit(self, visitor: Walker) -> None:
+            calls.append("loc walker exit")
+
+    class Visitor(Walker):
+        @on_entry
+        def start(self, here) -> None:  # noqa: ANN001
+            calls.append("walker any entry")
+
+        @on_entry
+        def at_stop(self, here: Stop) -> None:
+            calls.append("walker loc entry")
+
+        @on_exit
+        def done(self, here) -> None:  # noqa: ANN001
+            calls.append("walker any exit")
+
+    spawn(Visitor(), Stop())
+    assert calls == [
+        "walker any entry",
+        "walker loc entry",
+        "loc any entry",
+        "loc walker exit",
+        "walker any exit",
+    ]
+    assert (Visitor, Stop) in _ability_dispatch_cache
+
+    class Revisitor(Visitor):
+        pass
+
+    assert (Visitor, Stop) not in _ability_dispatch_cache
+    calls.clear()
+    spawn(Revisitor(), Stop())
+    assert calls[1:4] == ["walker loc entry", "loc any entry", "loc walker exit"]
+
+
+def test_visit_frontier_insertion_order():
+    """Test that visit splices into the walker frontier like list slicing."""
+    from jaclang.lib import Node, Walker, visit
+
+    nodes = [Node() for _ in range(6)]
+    for insert_loc in range(-8, 8):
+        walker = Walker()
+        expected = nodes[:4]
+        visit(walker, nodes[:4])
+        assert visit(walker, nodes[4:], insert_loc=insert_loc)
+        if insert_loc < -4 - 1:
+            pos = 0
+        elif insert_loc < 0:
+            pos = insert_loc + 4 + 1
+        else:
+            pos = insert_loc
+        expected = expected[:pos] + nodes[4:] + expected[pos:]
+        assert [a.archetype for a in walker.__jac__.next] == expected
+
+    walker = Walker()
+    walker.__jac__.ignores.add(nodes[0].__jac__.id)
+    assert not visit(walker, nodes[0])
+    assert not walker.__jac__.next
+
+
+def test_execution_context_per_thread():
+    """Test that each thread and thread_run task sees its own context."""
+    import threading
+
+    from jaclang import JacRuntime as Jac
+
+    main_ctx = Jac.create_j_context()
+    Jac.set_context(main_ctx)
+    barrier = threading.Barrier(2)
+    seen: dict[int, tuple[bool, bool]] = {}
+
+    def request(n: int) -> None:
+        ctx = Jac.create_j_context()
+        Jac.set_context(ctx)
+        barrier.wait()
+        root = Jac.root()
+        inherited = Jac.thread_wait(Jac.thread_run(Jac.get_context))
+        seen[n] = (root is ctx.get_root(), inherited is ctx)
+
+    threads = [threading.Thread(target=request, args=(n,)) for n in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {0: (True, True), 1: (True, True)}
+    assert Jac.get_context() is main_ctx
+    assert Jac.thread_wait(Jac.thread_run(Jac.get_context)) is main_ctx
+
+
+class Counter(NodeArchetype):
+    """Node sent to a flow worker."""
+
+    def __init__(self, n: int) -> None:
+        """Initialize the counter."""
+        self.n = n
+
+
+def test_thread_run_process_executor():
+    """Test that thread_run can send a call and its archetypes to a process."""
+    from jaclang import JacRuntime as Jac
+
+    Jac.set_context(Jac.create_j_context())
+    try:
+        counter = Counter(2)
+        Jac.connect(Jac.root(), counter)
+        step = 3
+        fut = Jac.thread_run(lambda c: c.n + step, counter, executor="process")
+        assert Jac.thread_wait(fut) == 5
+        fut = Jac.thread_run(lambda c: c, counter, executor="process")
+        copy = Jac.thread_wait(fut)
+        assert copy is not counter
+        assert (type(copy).__name__, copy.n) == ("Counter", 2)
+    finally:
+        Jac.reset_machine()
+
+
+def test_executor_pool_shared_across_threads():
+    """Test that concurrent first uses of an executor share one pool."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from jaclang.runtimelib.executor import get_pool, shutdown
+
+    try:
+        with ThreadPoolExecutor(8) as threads:
+            pools = list(threads.map(get_pool, ["process"] * 8))
+        assert all(pool is pools[0] for pool in pools)
+    finally:
+        shutdown()
+
+
+def test_process_executor_safety():
+    """Test process workers with other threads running and recursive closures."""
+    from jaclang import JacRuntime as Jac
+    from jaclang.runtimelib.executor import start_method
+
+    def fact(n: int) -> int:
+        return n * fact(n - 1) if n > 1 else 1
+
+    assert start_method(2) != "fork"
+    release = threading.Event()
+    waiter = threading.Thread(target=release.wait)
+    waiter.start()
+    try:
+        assert Jac.thread_wait(Jac.thread_run(fact, 5, executor="process")) == 120
+    finally:
+        release.set()
+        waiter.join()
+        Jac.reset_machine()
+
+
+def test_refs_shared_plan():
+    """Test that a compiled path plan is built once and reused per origin."""
+    from jaclang import JacRuntime as Jac
+    from jaclang.runtimelib.archetype import ObjectSpatialPath, ObjectSpatialPlan
+
+    builds: list[int] = []
+
+    def build() -> ObjectSpatialPath:
+        builds.append(1)
+        return ObjectSpatialPath([]).edge_out(node_type=Counter, node=lambda i: i.n > 1)
+
+    Jac.set_context(Jac.create_j_context())
+    try:
+        first, second = Counter(1), Counter(2)
+        Jac.connect(Jac.root(), [first, second])
+        Jac.connect(first, [Counter(3), Counter(0)])
+        plan = ObjectSpatialPlan(build)
+        assert [node.n for node in Jac.refs(plan, Jac.root())] == [2]
+        assert [node.n for node in Jac.refs(plan, first)] == [3]
+        assert [node.n for node in Jac.refs(plan, Jac.root())] == [2]
+        assert builds == [1]
+        assert len(plan.resolve().destinations) == 1
+    finally:
+        Jac.reset_machine()
@@ -4,11 +4,14 @@ import io
 import os
 import sys
 from collections.abc import Callable
+from pathlib import Path
 from typing import TypedDict
+from uuid import UUID
 
 import pytest
 
 from jaclang.cli import cli
+from jaclang.runtimelib.constructs import Anchor, NodeArchetype
 from jaclang.runtimelib.tests.conftest import fixture_abs_path
 
 
@@ -1109,7 +1112,7 @@ def test_custom_access_validation(
 
 def test_run_persistent_reuse():
     """Test that cli.run with session persists nodes to session file."""
-    import shelve
+    from jaclang.runtimelib.memory import open_shelf
 
     session = fixture_abs_path("test_run_persistent_reuse.session")
 
@@ -1123,7 +1126,7 @@ def test_run_persistent_reuse():
     )
 
     # Check session file directly (not via get_object which re-runs code)
-    with shelve.open(session) as shelf:
+    with open_shelf(session) as shelf:
         root = shelf["00000000-0000-0000-0000-000000000000"]
         first_run_edges = len(root.edges)
         first_run_keys = len(shelf.keys())
@@ -1143,7 +1146,7 @@ def test_run_persistent_reuse():
     )
 
     # Check session file again
-    with shelve.open(session) as shelf:
+    with open_shelf(session) as shelf:
         root = shelf["00000000-0000-0000-0000-000000000000"]
         second_run_edges = len(root.edges)
         second_run_keys = len(shelf.keys())
@@ -1155,3 +1158,308 @@ def test_run_persistent_reuse():
     assert second_run_edges == 2, "Root should still have only 2 edges (not 4)"
 
     del_session(session)
+
+
+class DirtyNode(NodeArchetype):
+    """Node used to check dirty tracking of persisted anchors."""
+
+    count: int = 0
+    tags: list[str] | None = None
+    labels: set[str] | None = None
+
+
+def test_dirty_tracking(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test that only changed anchors are written back to the session."""
+    from jaclang import JacRuntime as Jac
+    from jaclang.runtimelib import codec
+    from jaclang.runtimelib.memory import open_shelf
+
+    session = str(tmp_path / "dirty.session")
+
+    ctx = Jac.create_j_context(session=session)
+    Jac.set_context(ctx)
+    plain, tagged = DirtyNode(), DirtyNode(tags=[], labels={"a", "b", "c"})
+    Jac.connect(Jac.root(), [plain, tagged])
+    assert plain.__jac__.has_changed()
+    ctx.close()
+
+    # change detection compares encoded fields, so nothing here is pickled
+    monkeypatch.setattr(codec, "pickle_dumps", None)
+    ctx = Jac.create_j_context(session=session)
+    Jac.set_context(ctx)
+    plain_anchor = ctx.mem.find_by_id(plain.__jac__.id)
+    tagged_anchor = ctx.mem.find_by_id(tagged.__jac__.id)
+    assert plain_anchor.loaded and not plain_anchor.has_changed()
+    assert plain_anchor.snapshot is None
+    assert set(tagged_anchor.snapshot) == {"tags", "labels"}
+    assert not tagged_anchor.has_changed()
+
+    plain_anchor.archetype.count = 3
+    tagged_anchor.archetype.tags.append("seen")
+    assert plain_anchor.has_changed()
+    assert tagged_anchor.has_changed()
+    ctx.mem.commit()
+    assert not plain_anchor.has_changed()
+    assert not tagged_anchor.has_changed()
+    tagged_anchor.archetype.labels.discard("a")
+    assert tagged_anchor.has_changed()
+    ctx.close()
+
+    with open_shelf(session) as shelf:
+        assert shelf[str(plain.__jac__.id)].archetype.count == 3
+        assert shelf[str(tagged.__jac__.id)].archetype.tags == ["seen"]
+        assert shelf[str(tagged.__jac__.id)].archetype.labels == {"b", "c"}
+    Jac.set_context(Jac.create_j_context())
+
+
+def test_sqlite_storage(tmp_path: Path):
+    """Test the SQLite session backend and its indexed lookups."""
+    import sqlite3
+
+    from jaclang import JacRuntime as Jac
+    from jaclang.runtimelib.memory import SqliteStorage
+
+    path = tmp_path / "graph.db"
+
+    ctx = Jac.create_j_context(session=f"sqlite://{path}")
+    Jac.set_context(ctx)
+    assert isinstance(ctx.mem, SqliteStorage)
+    nodes = [DirtyNode(count=i) for i in range(3)]
+    Jac.connect(Jac.root(), nodes)
+    ctx.close()
+
+    ctx = Jac.create_j_context(session=f"sqlite://{path}")
+    Jac.set_context(ctx)
+    assert [root.__jac__.id for root in ctx.mem.all_root()] == [ctx.system_root.id]
+    owned = list(ctx.mem.find_by_root(ctx.system_root.id))
+    assert sorted(
+        a.archetype.count for a in owned if isinstance(a.archetype, DirtyNode)
+    ) == [0, 1, 2]
+    found = list(ctx.mem.find([n.__jac__.id for n in reversed(nodes)]))
+    assert [a.archetype.count for a in found] == [2, 1, 0]
+    assert Jac.reset_graph() == 6
+    ctx.close()
+
+    with sqlite3.connect(path) as db:
+        assert db.execute("SELECT count(*) FROM anchors").fetchone() == (1,)
+    Jac.set_context(Jac.create_j_context())
+
+
+def test_shelf_root_index(tmp_path: Path):
+    """Test the per-root anchor index kept in shelf sessions."""
+    import dbm
+
+    from jaclang import JacRuntime as Jac
+    from jaclang.runtimelib.memory import ROOT_INDEX, AnchorShelf, open_shelf
+
+    session = str(tmp_path / "graph.session")
+
+    ctx = Jac.create_j_context(session=session)
+    Jac.set_context(ctx)
+    nodes = [DirtyNode(count=i) for i in range(3)]
+    Jac.connect(Jac.root(), nodes)
+    ctx.close()
+
+    with open_shelf(session) as shelf:
+        assert len(shelf) == 7
+        assert shelf.root_ids() == [ctx.system_root.id]
+        assert len(shelf.owned_by(ctx.system_root.id)) == 6
+
+    # Sessions written before the index existed are indexed when opened.
+    with AnchorShelf(dbm.open(session, "w")) as shelf:
+        for key in list(shelf.dict.keys()):
+            if key.startswith(b"~"):
+                del shelf.dict[key]
+    ctx = Jac.create_j_context(session=session)
+    Jac.set_context(ctx)
+    ctx.mem.query = None
+    assert [root.__jac__.id for root in ctx.mem.all_root()] == [ctx.system_root.id]
+    owned = list(ctx.mem.find_by_root(ctx.system_root.id))
+    assert sorted(
+        a.archetype.count for a in owned if isinstance(a.archetype, DirtyNode)
+    ) == [0, 1, 2]
+    assert Jac.reset_graph() == 6
+    ctx.close()
+
+    with open_shelf(session) as shelf:
+        assert list(shelf) == [str(ctx.system_root.id)]
+        assert shelf.owned_by(ctx.system_root.id) == []
+        assert not any(
+            key.startswith(ROOT_INDEX + ctx.system_root.id.bytes)
+            for key in shelf.dict.keys()
+        )
+    Jac.set_context(Jac.create_j_context())
+
+
+def test_shelf_root_index_chunks(monkeypatch: pytest.MonkeyPatch):
+    """Test that index flushes rewrite only touched chunks and reads don't scan."""
+    from types import SimpleNamespace
+    from uuid import uuid4
+
+    import jaclang.runtimelib.memory as memory
+    from jaclang.runtimelib.memory import AnchorShelf
+
+    class Store(dict):
+        """Shelf store recording writes and refusing key scans."""
+
+        def __init__(self) -> None:
+            super().__init__()
+            self.writes: list[bytes] = []
+
+        def __setitem__(self, key: bytes, value: bytes) -> None:
+            self.writes.append(key)
+            super().__setitem__(key, value)
+
+        def keys(self) -> list[bytes]:  # type: ignore[override]
+            raise AssertionError("index reads must not scan the store")
+
+    monkeypatch.setattr(memory, "INDEX_CHUNK", 2)
+    root_id = uuid4()
+    anchors = [
+        SimpleNamespace(id=uuid4(), root=root_id, archetype=None) for _ in range(5)
+    ]
+    store = Store()
+    shelf = AnchorShelf(store)
+    for anchor in anchors:
+        shelf.index(anchor, True)
+    assert shelf.owned_by(root_id) == [anchor.id for anchor in anchors]
+    assert len(store.writes) == 4  # three chunks and the manifest
+
+    store.writes.clear()
+    shelf.index(anchors[0], False)
+    shelf.index(anchors[2], False)
+    shelf.index(anchors[2], True)
+    shelf.flush_index()
+    assert len(store.writes) == 1  # only the first chunk
+    assert shelf.owned_by(root_id) == [anchor.id for anchor in anchors[1:]]
+
+    store.writes.clear()
+    shelf.index(anchors[1], False)
+    shelf.index(anchors[0], True)
+    shelf.flush_index()
+    assert len(store.writes) == 2  # the last chunk and the manifest
+    assert shelf.owned_by(root_id) == [
+        anchor.id for anchor in anchors[2:] + anchors[:1]
+    ]
+
+
+def test_edge_prefetch(tmp_path: Path):
+    """Test that stored edges and their endpoints are loaded in bulk."""
+    import asyncio
+
+    from jaclang import JacRuntime as Jac
+
+    session = str(tmp_path / "graph.session")
+
+    ctx = Jac.create_j_context(session=session)
+    Jac.set_context(ctx)
+    Jac.connect(Jac.root(), [DirtyNode(count=i) for i in range(5)])
+    ctx.close()
+
+    def assert_bulk_loaded(resolve: Callable[[NodeArchetype], list]) -> None:
+        ctx = Jac.create_j_context(session=session)
+        Jac.set_context(ctx)
+        lookups: list = []
+        find_by_id = ctx.mem.find_by_id
+
+        def counted_find_by_id(anchor_id: UUID) -> Anchor | None:
+            lookups.append(anchor_id)
+            return find_by_id(anchor_id)
+
+        ctx.mem.find_by_id = counted_find_by_id
+        assert [node.count for node in resolve(Jac.root())] == [0, 1, 2, 3, 4]
+        assert lookups == []
+        ctx.close()
+
+    assert_bulk_loaded(Jac.refs)
+    assert_bulk_loaded(lambda node: asyncio.run(Jac.arefs(node)))
+    Jac.set_context(Jac.create_j_context())
+
+
+def test_access_cache(tmp_path: Path):
+    """Test that access levels are cached until permissions change."""
+    from jaclang import JacRuntime as Jac
+    from jaclang.runtimelib.archetype import AccessLevel, Root
+
+    session = str(tmp_path / "graph.session")
+
+    ctx = Jac.create_j_context(session=session)
+    Jac.set_context(ctx)
+    other = Root()
+    Jac.save(other)
+    node = DirtyNode()
+    Jac.connect(Jac.root(), node)
+    ctx.close()
+
+    ctx = Jac.create_j_context(session=session)
+    Jac.set_context(ctx)
+    anchor = ctx.mem.find_by_id(node.__jac__.id)
+    ctx.root_state = ctx.mem.find_by_id(other.__jac__.id)
+    lookups: list = []
+    find_one = ctx.mem.find_one
+
+    def counted_find_one(*args: UUID) -> Anchor | None:
+        lookups.append(args)
+        return find_one(*args)
+
+    ctx.mem.find_one = counted_find_one
+
+    assert not Jac.check_read_access(anchor)
+    assert not Jac.check_read_access(anchor)
+    assert len(lookups) == 1
+    Jac.perm_grant(anchor.archetype, AccessLevel.READ)
+    assert Jac.check_read_access(anchor)
+    assert not Jac.check_write_access(anchor)
+    assert len(lookups) == 2
+    Jac.allow_root(anchor.archetype, ctx.root_state.id, AccessLevel.WRITE)
+    assert Jac.check_write_access(anchor)
+    Jac.disallow_root(anchor.archetype, ctx.root_state.id)
+    Jac.perm_revoke(anchor.archetype)
+    assert not Jac.check_read_access(anchor)
+    assert len(lookups) == 4
+
+    # a permission changed from another context drops this context's cache
+    granter = Jac.create_j_context()
+    Jac.set_context(granter)
+    Jac.perm_grant(anchor.archetype, AccessLevel.READ)
+    granter.close()
+    Jac.set_context(ctx)
+    assert Jac.check_read_access(anchor)
+    assert len(lookups) == 5
+    ctx.close()
+    Jac.set_context(Jac.create_j_context())
+
+
+def test_anchor_codec():
+    """Test the binary anchor codec and its pickle fallback."""
+    import pickle
+    from uuid import uuid4
+
+    from jaclang import JacRuntime as Jac
+    from jaclang.runtimelib.archetype import AccessLevel
+    from jaclang.runtimelib.codec import decode, dumps, encode, loads
+
+    Jac.set_context(Jac.create_j_context())
+    node = DirtyNode(count=-7, tags=["a", "b"])
+    Jac.connect(Jac.root(), node)
+    Jac.perm_grant(node, AccessLevel.WRITE)
+    anchor = node.__jac__
+    anchor.access.roots.anchors[str(uuid4())] = AccessLevel.READ
+    anchor.archetype.extra = {"ids": (uuid4(), 1.5, b"raw"), "seen": {1, 2}}
+
+    loaded = decode(encode(anchor))
+    assert loaded.id == anchor.id and loaded.root == anchor.root
+    assert loaded.access == anchor.access and loaded.persistent
+    assert loaded.archetype.__jac__ is loaded and not loaded.has_changed()
+    assert loaded.state() == anchor.state()
+    assert [e.id for e in loaded.edges] == [e.id for e in anchor.edges]
+    assert not loaded.edges[0].is_populated()
+
+    edge = anchor.edges[0]
+    loaded_edge = loads(dumps(edge))
+    assert loaded_edge.source.id == edge.source.id
+    assert loaded_edge.target.id == edge.target.id
+    assert len(encode(edge)) < len(pickle.dumps(edge))
+
+    assert loads(pickle.dumps(anchor)).state() == anchor.state()
+    Jac.set_context(Jac.create_j_context())
@@ -1,21 +1,29 @@
 """Test for jac serve command and REST API server."""
 
 import contextlib
+import io
 import json
 import os
+import signal
 import socket
+import subprocess
+import sys
 import threading
 import time
 from collections.abc import Generator
 from http.server import HTTPServer
+from pathlib import Path
 from urllib.error import HTTPError
 from urllib.request import Request, urlopen
 
 import pytest
 
+import jaclang
 from jaclang.cli import cli
+from jaclang.runtimelib.archetype import NodeArchetype
+from jaclang.runtimelib.memory import ShelfStorage
 from jaclang.runtimelib.runtime import JacRuntime as Jac
-from jaclang.runtimelib.server import JacAPIServer, UserManager
+from jaclang.runtimelib.server import JacAPIServer, JacSerializer, UserManager
 from jaclang.runtimelib.tests.conftest import fixture_abs_path
 
 
@@ -56,11 +64,8 @@ class ServerFixture:
         test_name = request.node.name
         self.session_file = fixture_abs_path(f"test_serve_{test_name}.session")
 
-    def start_server(self, api_file: str = "serve_api.jac") -> None:
-        """Start the API server in a background thread."""
-        from http.server import HTTPServer
-
-        # Load the module
+    def create_server(self, api_file: str = "serve_api.jac") -> JacAPIServer:
+        """Load the API module and create a server for it."""
         base, mod, mach = cli.proc_file_sess(fixture_abs_path(api_file), "")
         Jac.set_base_path(base)
         Jac.jac_import(
@@ -69,16 +74,26 @@ class ServerFixture:
             override_name="__main__",
             lng="jac",
         )
-
-        # Create server
         self.server = JacAPIServer(
             module_name="__main__",
             session_path=self.session_file,
             port=self.port,
         )
+        return self.server
+
+    def start_server(
+        self, api_file: str = "serve_api.jac", threaded: bool = False
+    ) -> None:
+        """Start the API server in a background thread."""
+        from http.server import HTTPServer
+
+        self.create_server(api_file)
 
         # Start server in thread
         def run_server():
+            if threaded:
+                self.server.start(threaded=True)
+                return
             try:
                 self.server.load_module()
                 handler_class = self.server.create_handler()
@@ -144,12 +159,17 @@ class ServerFixture:
 
     def cleanup(self) -> None:
         """Clean up server resources."""
-        # Close user manager if it exists
+        # Close user manager and shared storage if they exist
         if self.server and hasattr(self.server, "user_manager"):
             with contextlib.suppress(Exception):
                 self.server.user_manager.close()
+        if self.server and hasattr(self.server, "pool"):
+            with contextlib.suppress(Exception):
+                self.server.pool.close()
 
         # Stop server if running
+        if self.server:
+            self.server.stop()
         if self.httpd:
             try:
                 self.httpd.shutdown()
@@ -463,6 +483,200 @@ def test_server_spawn_walker(server_fixture: ServerFixture) -> None:
     assert "result" in result3
 
 
+class Pair(NodeArchetype):
+    """Node used to check archetype serialization."""
+
+    name: str = ""
+    other: "Pair | None" = None
+
+    @property
+    def label(self) -> str:
+        """Upper case name."""
+        return self.name.upper()
+
+    def describe(self) -> str:
+        """Describe the node."""
+        return f"pair {self.name}"
+
+
+def test_serializer_schema() -> None:
+    """Test archetype serialization through per-class schemas."""
+    first, second = Pair(name="a"), Pair(name="b")
+    first.other, second.other = second, first
+    first.extra = [1, 2]
+
+    data = JacSerializer.serialize([first])[0]
+    assert list(data) == [
+        "_jac_type",
+        "_jac_id",
+        "_jac_archetype",
+        "extra",
+        "label",
+        "name",
+        "other",
+    ]
+    assert data["label"] == "A" and data["extra"] == [1, 2]
+    assert data["other"]["name"] == "b"
+    assert data["other"]["other"] == {
+        "_jac_type": "Pair",
+        "_jac_id": first.__jac__.id.hex,
+        "_jac_archetype": "node",
+    }
+    assert "extra" not in data["other"]
+    assert JacSerializer.schema(Pair) is JacSerializer.schema(Pair)
+    assert json.loads(JacSerializer.dumps({"data": data, 1: None})) == {
+        "data": data,
+        "1": None,
+    }
+
+
+def test_server_reuses_storage_handle(server_fixture: ServerFixture) -> None:
+    """Test that requests share one open storage handle per session."""
+    server_fixture.start_server()
+
+    create_result = server_fixture.request(
+        "POST", "/user/register", {"email": "pooluser@example.com", "password": "pass"}
+    )
+    token = create_result["token"]
+    assert server_fixture.server is not None
+    pool = server_fixture.server.pool
+    (handle,) = [h for h, _ in pool.handles.values()]
+
+    for title in ("First", "Second"):
+        result = server_fixture.request(
+            "POST", "/walker/CreateTask", {"title": title, "priority": 1}, token=token
+        )
+        assert "result" in result
+    assert [h for h, _ in pool.handles.values()] == [handle]
+
+    extra, _ = pool.shared("extra", io.StringIO)
+    assert pool.shared("extra", io.StringIO)[0] is extra
+
+    pool.close()
+    assert extra.closed
+
+    storage = ShelfStorage(server_fixture.session_file)
+    titles = sorted(
+        anchor.archetype.title
+        for anchor in storage.query()
+        if type(anchor.archetype).__name__ == "Task"
+    )
+    storage.close()
+    assert titles == ["First", "Second"]
+
+
+def test_threaded_server_not_blocked_by_slow_client(
+    server_fixture: ServerFixture,
+) -> None:
+    """Test that a stalled connection doesn't block other requests."""
+    server_fixture.start_server(threaded=True)
+
+    with socket.create_connection(("127.0.0.1", server_fixture.port)) as slow:
+        slow.sendall(b"GET / HTTP/1.1\r\n")
+        result = server_fixture.request(
+            "POST",
+            "/user/register",
+            {"email": "fast@example.com", "password": "pass"},
+        )
+        assert "token" in result
+
+    assert server_fixture.server is not None
+    assert server_fixture.server_thread is not None
+    server_fixture.server.stop()
+    server_fixture.server_thread.join(timeout=5)
+    assert not server_fixture.server_thread.is_alive()
+
+
+def test_server_restores_sigterm_handler(server_fixture: ServerFixture) -> None:
+    """Test that the server puts back the SIGTERM handler it replaced."""
+    server = server_fixture.create_server()
+    handlers: list[object] = []
+
+    def stop_when_serving() -> None:
+        while server.httpd is None:
+            time.sleep(0.01)
+        handlers.append(signal.getsignal(signal.SIGTERM))
+        server.stop()
+
+    previous = signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    try:
+        stopper = threading.Thread(target=stop_when_serving, daemon=True)
+        stopper.start()
+        server.start()
+        stopper.join(timeout=5)
+        assert handlers and handlers[0] is not signal.SIG_IGN
+        assert signal.getsignal(signal.SIGTERM) is signal.SIG_IGN
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+
+def test_server_worker_guards(
+    server_fixture: ServerFixture, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that multiple workers are refused where they can't work."""
+    server = server_fixture.create_server()
+    with pytest.raises(ValueError, match="sqlite://"):
+        server.start(workers=2)
+    monkeypatch.delattr(os, "fork", raising=False)
+    with pytest.raises(ValueError, match="not supported"):
+        server.start(workers=2)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_prefork_workers(server_fixture: ServerFixture, tmp_path: Path) -> None:
+    """Test that pre-forked workers share a SQLite session and stop on SIGTERM."""
+    db = tmp_path / "prefork.db"
+    env = {**os.environ, "PYTHONPATH": str(Path(jaclang.__file__).parents[1])}
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "jaclang",
+            "serve",
+            fixture_abs_path("serve_api.jac"),
+            "--session",
+            f"sqlite://{db}",
+            "--port",
+            str(server_fixture.port),
+            "--workers",
+            "2",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        env=env,
+    )
+    try:
+        for _ in range(600):
+            try:
+                token = server_fixture.request(
+                    "POST",
+                    "/user/register",
+                    {"email": "prefork@example.com", "password": "pass"},
+                )["token"]
+                break
+            except OSError:
+                time.sleep(0.1)
+        for title in ("First", "Second", "Third"):
+            result = server_fixture.request(
+                "POST",
+                "/walker/CreateTask",
+                {"title": title, "priority": 1},
+                token=token,
+            )
+            assert "result" in result
+        server_fixture.request("POST", "/walker/ListTasks", {}, token=token)
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        output, _ = proc.communicate(timeout=30)
+
+    assert proc.returncode == 0, output
+    assert "2 worker(s)" in output
+    assert "Shutting down server" in output
+    for title in ("First", "Second", "Third"):
+        assert f"Found task: {title}" in output
+
+
 def test_server_user_isolation(server_fixture: ServerFixture) -> None:
     """Test that users have isolated graph spaces."""
     server_fixture.start_server()
@@ -747,9 +961,10 @@ def test_root_data_persistence_across_server_restarts(
     assert "result" in list_before
 
     # Shutdown first server instance
-    # Close user manager first to release the shelf lock
+    # Close user manager and storage pool first to release the shelf lock
     if server_fixture.server and hasattr(server_fixture.server, "user_manager"):
         server_fixture.server.user_manager.close()
+        server_fixture.server.pool.close()
 
     if server_fixture.httpd:
         server_fixture.httpd.shutdown()
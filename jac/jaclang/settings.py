@@ -18,10 +18,17 @@ class Settings:
     show_internal_stack_errs: bool = False
 
     # Compiler configuration
+    bytecode_cache: bool = True
     ignore_test_annex: bool = False
     pyfile_raise: bool = False
     pyfile_raise_full: bool = False
 
+    # Runtime configuration
+    session_backend: str = "shelf"
+    anchor_codec: str = "binary"
+    flow_executor: str = "thread"
+    flow_workers: int = 0
+
     # Formatter configuration
     max_line_length: int = 88
 
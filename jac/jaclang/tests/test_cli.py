@@ -444,6 +444,7 @@ def test_graph_coverage() -> None:
         "file",
         "edge_type",
         "format",
+        "sink",
     }
     printgraph_params.update({"initial", "saveto", "connection", "session"})
     assert printgraph_params.issubset(graph_params)
@@ -826,3 +827,26 @@ def test_format_tracks_changed_files() -> None:
         assert process.returncode == 1
         assert "2/2" in stderr
         assert "(1 changed)" in stderr
+
+
+def test_parallel_check_matches_sequential(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Test that check --jobs reports the same alerts as a sequential run."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with open(os.path.join(tmpdir, "shared.jac"), "w") as f:
+            f.write('def greet() -> int {\n    return "hi";\n}\n')
+        for name in ("a", "b", "c"):
+            with open(os.path.join(tmpdir, f"{name}.jac"), "w") as f:
+                f.write(
+                    f'import shared;\n\nwith entry {{\n    x: int = "{name}";\n}}\n'
+                )
+
+        outputs = []
+        for jobs in (1, 2):
+            with pytest.raises(SystemExit):
+                cli.check([tmpdir], jobs=jobs)
+            outputs.append(re.sub(r" at 0x[0-9a-f]+", "", capsys.readouterr().err))
+
+    assert outputs[0] == outputs[1]
+    assert "(4 errors, 0 warnings)" in outputs[0]
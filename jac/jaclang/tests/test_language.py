@@ -149,6 +149,20 @@ def test_printgraph_mermaid(
     assert "flowchart LR" in stdout_value
 
 
+def test_printgraph_stream(
+    fixture_path: Callable[[str], str],
+    capture_stdout: Callable[[], AbstractContextManager[io.StringIO]],
+) -> None:
+    """Test streaming and sampling in printgraph."""
+    with capture_stdout() as captured_output:
+        Jac.jac_import("builtin_printgraph_stream", base_path=fixture_path("./"))
+    stdout_value = captured_output.getvalue().split("\n")
+    assert stdout_value[:6] == ["True True", "True"] * 3
+    assert stdout_value[6] == "4 3"
+    assert stdout_value[7] == "1 0"
+    assert stdout_value[8] == "0 True"
+
+
 def test_chandra_bugs(
     fixture_path: Callable[[str], str],
     capture_stdout: Callable[[], AbstractContextManager[io.StringIO]],
@@ -465,6 +479,45 @@ def test_edge_walk(
     assert "[node_a(val=42), node_a(val=42)]\n" in stdout_value
 
 
+def test_edge_type_index(
+    fixture_path: Callable[[str], str],
+    capture_stdout: Callable[[], AbstractContextManager[io.StringIO]],
+) -> None:
+    """Test typed edge hops served from the node edge index."""
+    with capture_stdout() as captured_output:
+        Jac.jac_import("edge_type_index", base_path=fixture_path("./"))
+    stdout_value = captured_output.getvalue().split("\n")
+    assert stdout_value[:7] == [
+        "['b', 'd']",
+        "['d']",
+        "['c']",
+        "['c']",
+        "[]",
+        "['b', 'd', 'c']",
+        "2",
+    ]
+    assert stdout_value[7:14] == [
+        "['c', 'a']",
+        "['a']",
+        "['c', 'a']",
+        "['d']",
+        "['c']",
+        "[]",
+        "['d', 'b']",
+    ]
+
+
+def test_edge_path_locals(
+    fixture_path: Callable[[str], str],
+    capture_stdout: Callable[[], AbstractContextManager[io.StringIO]],
+) -> None:
+    """Test edge path filters reading locals that shadow a global."""
+    with capture_stdout() as captured_output:
+        Jac.jac_import("edge_path_locals", base_path=fixture_path("./"))
+    stdout_value = captured_output.getvalue().split("\n")
+    assert stdout_value[:5] == ["[]", "[N(v=2)]", "[]", "[1, 0]", "[N(v=2)]"]
+
+
 def test_tuple_of_tuple_assign(
     fixture_path: Callable[[str], str],
     capture_stdout: Callable[[], AbstractContextManager[io.StringIO]],
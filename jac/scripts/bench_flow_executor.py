@@ -0,0 +1,54 @@
+"""Benchmark for CPU-bound `flow` bodies on each executor.
+
+Runs the same batch of CPU-bound calls through the thread, process and
+interpreter executors and prints the wall time and the speedup over the
+thread pool. Workers are started before timing, and the process and
+interpreter executors can only scale up to the number of CPUs.
+
+Usage: python scripts/bench_flow_executor.py [tasks] [size]
+"""
+
+import os
+import sys
+import time
+
+from jaclang import JacRuntime as Jac
+from jaclang.runtimelib.executor import shutdown
+
+
+def count_primes(limit: int) -> int:
+    """Count the primes below `limit` by trial division."""
+    return sum(
+        all(n % d for d in range(2, int(n**0.5) + 1)) for n in range(2, limit)
+    )
+
+
+def run(executor: str, tasks: int, size: int) -> float:
+    """Run `tasks` calls on an executor and return the wall time."""
+    start = time.perf_counter()
+    futures = [
+        Jac.thread_run(count_primes, size, executor=executor) for _ in range(tasks)
+    ]
+    for fut in futures:
+        Jac.thread_wait(fut)
+    return time.perf_counter() - start
+
+
+def main(tasks: int, size: int) -> None:
+    """Run the benchmark."""
+    Jac.get_context()
+    print(f"{tasks} tasks, primes below {size}, {os.cpu_count()} CPUs")
+    base = run("thread", tasks, size)
+    print(f"{'thread':<14}{base:>9.2f} s")
+    for executor in ("process", "interpreter"):
+        run(executor, 1, 2)
+        elapsed = run(executor, tasks, size)
+        print(f"{executor:<14}{elapsed:>9.2f} s {base / elapsed:>8.2f}x")
+    shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 16,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200_000,
+    )
@@ -0,0 +1,46 @@
+"""Micro-benchmark for JacRuntimeInterface hook dispatch overhead.
+
+Compares the per-call cost of a hook through the proxy with direct dispatch
+enabled, through the proxy with pluggy dispatch, and of calling the
+implementation function itself.
+
+Usage: python scripts/bench_plugin_dispatch.py [calls]
+"""
+
+import sys
+import timeit
+
+from jaclang import JacRuntime as Jac
+from jaclang.runtimelib.constructs import NodeArchetype
+from jaclang.runtimelib.runtime import JacRuntimeImpl, plugin_manager
+
+
+class BenchNode(NodeArchetype):
+    """Node used as the access check target."""
+
+
+def bench(label: str, stmt: object, calls: int, base: float | None = None) -> float:
+    """Time a callable and print its per-call cost in nanoseconds."""
+    per_call = min(timeit.repeat(stmt, number=calls, repeat=5)) / calls * 1e9
+    extra = f"  (+{per_call - base:.0f} ns over impl)" if base is not None else ""
+    print(f"{label:<28}{per_call:>10.0f} ns/call{extra}")
+    return per_call
+
+
+def main(calls: int) -> None:
+    """Run the benchmark."""
+    Jac.get_context()
+    anchor = BenchNode().__jac__
+    impl = JacRuntimeImpl.check_read_access
+
+    print(f"check_read_access, {calls} calls, best of 5")
+    base = bench("implementation function", lambda: impl(anchor), calls)
+    plugin_manager.set_direct_dispatch(True)
+    bench("proxy, direct dispatch", lambda: Jac.check_read_access(anchor), calls, base)
+    plugin_manager.set_direct_dispatch(False)
+    bench("proxy, pluggy dispatch", lambda: Jac.check_read_access(anchor), calls, base)
+    plugin_manager.set_direct_dispatch(True)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,97 @@
+"""Benchmark for walker frontier handling on large graphs.
+
+Runs a breadth-first walker (``visit [-->]`` appends to the frontier) and a
+depth-first walker (``visit :0: [-->]`` prepends to it) over a balanced tree,
+plus a breadth-first walker over a single hub node with many neighbours.
+
+Usage: python scripts/bench_walker_frontier.py [nodes] [fanout]
+"""
+
+import sys
+import time
+
+from jaclang import JacRuntime as Jac
+from jaclang.lib import Node, Walker, on_entry
+
+
+class Item(Node):
+    """Graph node visited by the walkers."""
+
+
+class Bfs(Walker):
+    """Visit every reachable node breadth first."""
+
+    count: int = 0
+
+    @on_entry
+    def step(self, here: Node) -> None:
+        self.count += 1
+        Jac.visit(self, Jac.refs(here))
+
+
+class Dfs(Walker):
+    """Visit every reachable node depth first."""
+
+    count: int = 0
+
+    @on_entry
+    def step(self, here: Node) -> None:
+        self.count += 1
+        Jac.visit(self, Jac.refs(here), insert_loc=0)
+
+
+def build_tree(nodes: int, fanout: int) -> None:
+    """Attach a balanced tree of `nodes` nodes below root."""
+    level = [Jac.root()]
+    made = 0
+    while made < nodes:
+        next_level = []
+        for parent in level:
+            for _ in range(min(fanout, nodes - made)):
+                child = Item()
+                Jac.connect(parent, child)
+                next_level.append(child)
+                made += 1
+            if made >= nodes:
+                break
+        level = next_level
+
+
+def build_hub(nodes: int) -> None:
+    """Attach a single hub node with `nodes` neighbours below root."""
+    hub = Item()
+    Jac.connect(Jac.root(), hub)
+    for _ in range(nodes):
+        Jac.connect(hub, Item())
+
+
+def bench(label: str, walker: Bfs | Dfs) -> None:
+    """Spawn a walker on root and print its throughput."""
+    start = time.perf_counter()
+    Jac.spawn(walker, Jac.root())
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<14}{walker.count:>10} visits {elapsed:>9.2f} s"
+        f" {walker.count / elapsed:>12.0f} visits/s"
+    )
+
+
+def main(nodes: int, fanout: int) -> None:
+    """Run the benchmark."""
+    Jac.get_context()
+    print(f"{nodes} nodes, fanout {fanout}")
+    build_tree(nodes, fanout)
+    bench("tree, bfs", Bfs())
+    bench("tree, dfs", Dfs())
+
+    Jac.reset_machine()
+    Jac.get_context()
+    build_hub(nodes)
+    bench("hub, bfs", Bfs())
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+    )
@@ -1,4 +1,5 @@
 find . -name "__jac_gen__" -exec rm -rf {} \;
+find . -name "__jac_cache__" -exec rm -rf {} \;
 find . -name "*session.bak" -exec rm -rf {} \;
 find . -name "*session.dat" -exec rm -rf {} \;
 find . -name "*session.dir" -exec rm -rf {} \;